@@ -15,16 +15,24 @@ CREATE TABLE IF NOT EXISTS users (
     INDEX idx_created_at (created_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Create statement_dictionary table
+CREATE TABLE IF NOT EXISTS statement_dictionary (
+    stmt_id INT AUTO_INCREMENT PRIMARY KEY,
+    stmt_hash CHAR(64) NOT NULL UNIQUE,
+    query_text TEXT NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 -- Create transactions_log table
 CREATE TABLE IF NOT EXISTS transactions_log (
     id INT AUTO_INCREMENT PRIMARY KEY,
     transaction_id VARCHAR(255) NOT NULL,
     query_type VARCHAR(50) NOT NULL,
-    query_text TEXT NOT NULL,
+    stmt_id INT NOT NULL,
     status VARCHAR(50) NOT NULL,
     node_id INT NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     INDEX idx_transaction_id (transaction_id),
+    INDEX idx_stmt_id (stmt_id),
     INDEX idx_status (status),
     INDEX idx_created_at (created_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,60 @@
+-- Move transactions_log from inline query_text to statement_dictionary ids.
+-- Idempotent: safe to run on fresh databases and to re-run on migrated ones.
+
+CREATE TABLE IF NOT EXISTS statement_dictionary (
+    stmt_id INT AUTO_INCREMENT PRIMARY KEY,
+    stmt_hash CHAR(64) NOT NULL UNIQUE,
+    query_text TEXT NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Add stmt_id (and its index) when missing
+SET @has_stmt_id = (
+    SELECT COUNT(*) FROM information_schema.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'transactions_log' AND COLUMN_NAME = 'stmt_id'
+);
+SET @ddl = IF(
+    @has_stmt_id = 0,
+    'ALTER TABLE transactions_log ADD COLUMN stmt_id INT NOT NULL DEFAULT 0 AFTER query_type, ADD INDEX idx_stmt_id (stmt_id)',
+    'DO 0'
+);
+PREPARE migration FROM @ddl;
+EXECUTE migration;
+DEALLOCATE PREPARE migration;
+
+-- Legacy query_text: backfill the dictionary, point old rows at it, then relax NOT NULL
+SET @has_query_text = (
+    SELECT COUNT(*) FROM information_schema.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'transactions_log' AND COLUMN_NAME = 'query_text'
+);
+
+SET @ddl = IF(
+    @has_query_text = 1,
+    'INSERT IGNORE INTO statement_dictionary (stmt_hash, query_text)
+     SELECT DISTINCT SHA2(query_text, 256), query_text FROM transactions_log
+     WHERE query_text IS NOT NULL',
+    'DO 0'
+);
+PREPARE migration FROM @ddl;
+EXECUTE migration;
+DEALLOCATE PREPARE migration;
+
+SET @ddl = IF(
+    @has_query_text = 1,
+    'UPDATE transactions_log l
+     JOIN statement_dictionary d ON d.stmt_hash = SHA2(l.query_text, 256)
+     SET l.stmt_id = d.stmt_id
+     WHERE l.stmt_id = 0 AND l.query_text IS NOT NULL',
+    'DO 0'
+);
+PREPARE migration FROM @ddl;
+EXECUTE migration;
+DEALLOCATE PREPARE migration;
+
+SET @ddl = IF(
+    @has_query_text = 1,
+    'ALTER TABLE transactions_log MODIFY COLUMN query_text TEXT NULL',
+    'DO 0'
+);
+PREPARE migration FROM @ddl;
+EXECUTE migration;
+DEALLOCATE PREPARE migration;
@@ -7,6 +7,7 @@
 # 1. Create the database for the specified node
 # 2. Create the ddb_user with permissions
 # 3. Initialize the schema and sample data
+# 4. Apply schema migrations for databases created by older versions
 
 set -e
 
@@ -55,16 +56,24 @@ CREATE TABLE IF NOT EXISTS users (
     INDEX idx_created_at (created_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Create statement_dictionary table
+CREATE TABLE IF NOT EXISTS statement_dictionary (
+    stmt_id INT AUTO_INCREMENT PRIMARY KEY,
+    stmt_hash CHAR(64) NOT NULL UNIQUE,
+    query_text TEXT NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 -- Create transactions_log table
 CREATE TABLE IF NOT EXISTS transactions_log (
     id INT AUTO_INCREMENT PRIMARY KEY,
     transaction_id VARCHAR(255) NOT NULL,
     query_type VARCHAR(50) NOT NULL,
-    query_text TEXT NOT NULL,
+    stmt_id INT NOT NULL,
     status VARCHAR(50) NOT NULL,
     node_id INT NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     INDEX idx_transaction_id (transaction_id),
+    INDEX idx_stmt_id (stmt_id),
     INDEX idx_status (status),
     INDEX idx_created_at (created_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -83,5 +92,8 @@ SELECT * FROM (SELECT 'Carol Williams', 'carol@example.com') AS tmp
 WHERE NOT EXISTS (SELECT 1 FROM users WHERE email = 'carol@example.com');
 EOF
 
+# Bring tables created by older versions up to the current schema
+mysql -u root -p"$MYSQL_ROOT_PASSWORD" "$DATABASE_NAME" < "$(dirname "$0")/migrations/001_transactions_log_stmt_id.sql"
+
 echo "MySQL setup complete for Node $NODE_ID!"
 echo "Database '$DATABASE_NAME' is ready."
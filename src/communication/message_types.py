@@ -17,6 +17,7 @@ TRANSACTION_ROLLBACK = "TRANSACTION_ROLLBACK"
 
 QUERY_RESPONSE = "QUERY_RESPONSE"
 REPLICATION_ACK = "REPLICATION_ACK"
+REPLICATION_ACK_BATCH = "REPLICATION_ACK_BATCH"
 REPLICATION_NACK = "REPLICATION_NACK"
 ERROR = "ERROR"
 ACK = "ACK"
@@ -53,3 +54,9 @@ def is_election_message(message_type: str) -> bool:
 def is_heartbeat_message(message_type: str) -> bool:
 
     return message_type in [HEARTBEAT, HEARTBEAT_ACK]
+
+
+def is_oneway_message(message_type: str) -> bool:
+
+    oneway_types = [HEARTBEAT, COORDINATOR_ANNOUNCEMENT, TRANSACTION_ABORT, REPLICATION_ACK_BATCH]
+    return message_type in oneway_types
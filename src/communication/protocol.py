@@ -1,34 +1,29 @@
-import json
-from datetime import datetime
-from typing import Dict, Any, Optional
+import orjson
+from typing import Dict, Any, List, Optional
 from src.security.checksum import add_checksum, verify_message_checksum
 from src.utils.helpers import generate_message_id, get_timestamp
 from src.communication import message_types
 
 
-class DateTimeEncoder(json.JSONEncoder):
-
-    def default(self, obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        return super().default(obj)
-
-
 class MessageProtocol:
 
     @staticmethod
     def encode_message(message: Dict[str, Any]) -> bytes:
 
-        message_str = json.dumps(message, cls=DateTimeEncoder)
-        return message_str.encode('utf-8')
+        return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS)
+
+    @staticmethod
+    def frame(message: Dict[str, Any]) -> bytes:
+
+        encoded_message = MessageProtocol.encode_message(message)
+        return len(encoded_message).to_bytes(4, byteorder='big') + encoded_message
 
     @staticmethod
     def decode_message(data: bytes) -> Dict[str, Any]:
 
         try:
-            message_str = data.decode('utf-8')
-            return json.loads(message_str)
-        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError as e:
             raise ValueError(f"Failed to decode message: {e}")
 
     @staticmethod
@@ -76,16 +71,33 @@ class MessageProtocol:
     def create_replication_message(
         sender_id: int,
         query: str,
-        transaction_id: str
+        transaction_id: str,
+        ack_batched: bool = False
     ) -> Dict[str, Any]:
 
+        data = {
+            'query': query,
+            'transaction_id': transaction_id
+        }
+        if ack_batched:
+            data['ack_batched'] = True
+
         return MessageProtocol.create_message(
             message_types.REPLICATION,
             sender_id,
-            {
-                'query': query,
-                'transaction_id': transaction_id
-            }
+            data
+        )
+
+    @staticmethod
+    def create_replication_batch_message(
+        sender_id: int,
+        entries: List[Dict[str, str]]
+    ) -> Dict[str, Any]:
+
+        return MessageProtocol.create_message(
+            message_types.REPLICATION,
+            sender_id,
+            {'entries': entries}
         )
 
     @staticmethod
@@ -192,6 +204,20 @@ class MessageProtocol:
             response_data
         )
 
+    @staticmethod
+    def create_ack(sender_id: int) -> Dict[str, Any]:
+
+        return MessageProtocol.create_message(message_types.ACK, sender_id)
+
+    @staticmethod
+    def expects_response(message: Dict[str, Any]) -> bool:
+
+        if message_types.is_oneway_message(message.get('type')):
+            return False
+
+        # Async replication is confirmed later through REPLICATION_ACK_BATCH
+        return not message.get('data', {}).get('ack_batched', False)
+
     @staticmethod
     def verify_message(message: Dict[str, Any]) -> bool:
 
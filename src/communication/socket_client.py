@@ -1,9 +1,16 @@
 import socket
 import logging
-from typing import Dict, Any, Optional
+import selectors
+import threading
+import time
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from src.communication.protocol import MessageProtocol
 
 
+class _ClosedBeforeResponse(ConnectionResetError):
+    pass
+
+
 class SocketClient:
 
     def __init__(self, timeout: int = 5):
@@ -12,6 +19,16 @@ class SocketClient:
         self.logger = logging.getLogger(__name__)
         self.buffer_size = 65536  # 64KB buffer
 
+        self._oneway_sockets: Dict[Tuple[str, int], socket.socket] = {}
+        self._oneway_locks: Dict[Tuple[str, int], threading.Lock] = {}
+        self._oneway_guard = threading.Lock()
+
+        # Idle request/response sockets per destination, checked out for one exchange at a time
+        self.pool_max_idle = 4
+        self.pool_idle_timeout = 30.0
+        self._pool: Dict[Tuple[str, int], List[Tuple[socket.socket, float]]] = {}
+        self._pool_lock = threading.Lock()
+
     def send_message(
         self,
         host: str,
@@ -20,27 +37,90 @@ class SocketClient:
         wait_for_response: bool = True
     ) -> Optional[Dict[str, Any]]:
 
-        sock = None
-        try:
-            # Create socket
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(self.timeout)
+        frame = MessageProtocol.frame(message)
+        self.logger.debug(f"Sending {message.get('type')} message to {host}:{port}")
+
+        return self.send_raw(host, port, frame, wait_for_response)
+
+    def send_raw(
+        self,
+        host: str,
+        port: int,
+        frame: bytes,
+        wait_for_response: bool = True
+    ) -> Optional[Dict[str, Any]]:
+
+        if not wait_for_response:
+            return self._send_unpooled(host, port, frame)
 
-            self.logger.debug(f"Connecting to {host}:{port}")
-            sock.connect((host, port))
+        key = (host, port)
+
+        for attempt in range(2):
+            sock, reused = self._checkout(key)
+            retry = reused and not attempt
+
+            try:
+                sock.sendall(frame)
+                self.logger.debug(f"Sent message to {host}:{port}")
 
-            encoded_message = MessageProtocol.encode_message(message)
-            message_length = len(encoded_message)
+            except socket.timeout:
+                self._discard(sock)
+                self.logger.error(f"Timeout connecting to {host}:{port}")
+                raise TimeoutError(f"Connection to {host}:{port} timed out")
 
-            sock.sendall(message_length.to_bytes(4, byteorder='big'))
+            except socket.error as e:
+                self._discard(sock)
 
-            sock.sendall(encoded_message)
-            self.logger.debug(f"Sent message to {host}:{port}: {message.get('type')}")
+                # A failed write never reached the handler, so a stale pooled socket is safe to retry
+                if retry:
+                    self.logger.debug(f"Pooled connection to {host}:{port} went stale: {e}")
+                    continue
 
-            if wait_for_response:
+                self.logger.error(f"Socket error connecting to {host}:{port}: {e}")
+                raise ConnectionError(f"Failed to connect to {host}:{port}: {e}")
+
+            try:
                 response = self._receive_message(sock)
                 self.logger.debug(f"Received response from {host}:{port}")
-                return response
+
+            except _ClosedBeforeResponse as e:
+                self._discard(sock)
+
+                # EOF with zero response bytes: the peer closed the idle socket unread
+                if retry:
+                    self.logger.debug(f"Pooled connection to {host}:{port} was closed by peer: {e}")
+                    continue
+
+                self.logger.error(f"Socket error connecting to {host}:{port}: {e}")
+                raise ConnectionError(f"Failed to connect to {host}:{port}: {e}")
+
+            except socket.timeout:
+                self._discard(sock)
+                self.logger.error(f"Timeout connecting to {host}:{port}")
+                raise TimeoutError(f"Connection to {host}:{port} timed out")
+
+            except socket.error as e:
+                # The request may already have run on the peer, so it is never replayed
+                self._discard(sock)
+                self.logger.error(f"Socket error connecting to {host}:{port}: {e}")
+                raise ConnectionError(f"Failed to connect to {host}:{port}: {e}")
+
+            except Exception as e:
+                self._discard(sock)
+                self.logger.error(f"Unexpected error sending message to {host}:{port}: {e}")
+                raise
+
+            self._checkin(key, sock)
+            return response
+
+    def _send_unpooled(self, host: str, port: int, frame: bytes) -> None:
+
+        sock = None
+        try:
+            sock = self._connect((host, port))
+
+            sock.sendall(frame)
+            self.logger.debug(f"Sent message to {host}:{port}")
 
             return None
 
@@ -63,11 +143,198 @@ class SocketClient:
                 except Exception:
                     pass
 
+    def _connect(self, key: Tuple[str, int]) -> socket.socket:
+
+        self.logger.debug(f"Connecting to {key[0]}:{key[1]}")
+
+        sock = socket.create_connection(key, timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        return sock
+
+    def _checkout(self, key: Tuple[str, int]) -> Tuple[socket.socket, bool]:
+
+        now = time.monotonic()
+
+        with self._pool_lock:
+            idle = self._pool.get(key)
+
+            while idle:
+                sock, checked_in_at = idle.pop()
+                if now - checked_in_at < self.pool_idle_timeout:
+                    return sock, True
+                self._discard(sock)
+
+        try:
+            return self._connect(key), False
+        except socket.timeout:
+            self.logger.error(f"Timeout connecting to {key[0]}:{key[1]}")
+            raise TimeoutError(f"Connection to {key[0]}:{key[1]} timed out")
+        except socket.error as e:
+            self.logger.error(f"Socket error connecting to {key[0]}:{key[1]}: {e}")
+            raise ConnectionError(f"Failed to connect to {key[0]}:{key[1]}: {e}")
+
+    def _checkin(self, key: Tuple[str, int], sock: socket.socket):
+
+        with self._pool_lock:
+            idle = self._pool.setdefault(key, [])
+            if len(idle) < self.pool_max_idle:
+                idle.append((sock, time.monotonic()))
+                return
+
+        self._discard(sock)
+
+    def _discard(self, sock: socket.socket):
+
+        try:
+            sock.close()
+        except Exception:
+            pass
+
+    def send_oneway(self, host: str, port: int, frame: bytes):
+
+        key = (host, port)
+
+        with self._oneway_lock(key):
+            for attempt in range(2):
+                sock = self._oneway_sockets.get(key)
+
+                try:
+                    if sock is None:
+                        sock = self._oneway_sockets[key] = self._connect(key)
+
+                    sock.sendall(frame)
+                    return
+
+                except OSError as e:
+                    self._drop_oneway(key, sock)
+
+                    if attempt:
+                        self.logger.error(f"Socket error sending to {host}:{port}: {e}")
+                        raise ConnectionError(f"Failed to send to {host}:{port}: {e}")
+
+    def send_batch(self, targets: Iterable[Tuple[str, int]], frame: bytes) -> Dict[Tuple[str, int], Exception]:
+
+        # Writes one frame to many peers over the persistent oneway sockets without
+        # letting a slow peer hold up the rest; returns the targets that failed
+        failures: Dict[Tuple[str, int], Exception] = {}
+        held = []
+        selector = selectors.DefaultSelector()
+
+        try:
+            for key in sorted(set(targets)):
+                lock = self._oneway_lock(key)
+                lock.acquire()
+                held.append(lock)
+
+                for attempt in range(2):
+                    sock = self._oneway_sockets.get(key)
+
+                    try:
+                        if sock is None:
+                            sock = self._oneway_sockets[key] = self._connect(key)
+
+                        sock.setblocking(False)
+                        try:
+                            sent = sock.send(frame)
+                        except BlockingIOError:
+                            sent = 0
+
+                        if sent < len(frame):
+                            selector.register(sock, selectors.EVENT_WRITE, (key, memoryview(frame)[sent:]))
+                        else:
+                            sock.settimeout(self.timeout)
+                        break
+
+                    except OSError as e:
+                        self._drop_oneway(key, sock)
+                        if attempt:
+                            failures[key] = e
+
+            deadline = time.monotonic() + self.timeout
+
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                events = selector.select(remaining) if remaining > 0 else []
+
+                if not events:
+                    for selector_key in list(selector.get_map().values()):
+                        key = selector_key.data[0]
+                        selector.unregister(selector_key.fileobj)
+                        # A partly written frame leaves the stream unusable
+                        self._drop_oneway(key, selector_key.fileobj)
+                        failures[key] = TimeoutError(f"Send to {key[0]}:{key[1]} timed out")
+                    break
+
+                for selector_key, _ in events:
+                    sock = selector_key.fileobj
+                    key, pending = selector_key.data
+
+                    try:
+                        sent = sock.send(pending)
+                    except BlockingIOError:
+                        continue
+                    except OSError as e:
+                        selector.unregister(sock)
+                        self._drop_oneway(key, sock)
+                        failures[key] = e
+                        continue
+
+                    if sent < len(pending):
+                        selector.modify(sock, selectors.EVENT_WRITE, (key, pending[sent:]))
+                    else:
+                        selector.unregister(sock)
+                        sock.settimeout(self.timeout)
+
+        finally:
+            selector.close()
+            for lock in held:
+                lock.release()
+
+        for key, error in failures.items():
+            self.logger.debug(f"Batched send to {key[0]}:{key[1]} failed: {error}")
+
+        return failures
+
+    def _oneway_lock(self, key: Tuple[str, int]) -> threading.Lock:
+
+        with self._oneway_guard:
+            lock = self._oneway_locks.get(key)
+            if lock is None:
+                lock = self._oneway_locks[key] = threading.Lock()
+
+        return lock
+
+    def _drop_oneway(self, key: Tuple[str, int], sock: Optional[socket.socket]):
+
+        self._oneway_sockets.pop(key, None)
+        if sock is not None:
+            self._discard(sock)
+
+    def close(self):
+
+        with self._oneway_guard:
+            sockets = list(self._oneway_sockets.values())
+            self._oneway_sockets.clear()
+
+        with self._pool_lock:
+            for idle in self._pool.values():
+                sockets.extend(sock for sock, _ in idle)
+            self._pool.clear()
+
+        for sock in sockets:
+            try:
+                sock.close()
+            except Exception:
+                pass
+
     def _receive_message(self, sock: socket.socket) -> Dict[str, Any]:
 
         length_data = self._receive_exact(sock, 4)
         if not length_data:
-            raise ValueError("Failed to receive message length")
+            raise _ClosedBeforeResponse("Connection closed before response")
+        if len(length_data) < 4:
+            raise ConnectionResetError("Connection closed mid-response")
 
         message_length = int.from_bytes(length_data, byteorder='big')
 
@@ -14,6 +14,7 @@ class SocketServer:
         self.message_handler = message_handler
         self.logger = logging.getLogger(__name__)
         self.buffer_size = 65536  # 64KB buffer
+        self.idle_timeout = 60.0  # seconds a persistent connection may stay quiet
         self.running = False
         self.server_socket = None
         self.server_thread = None
@@ -64,6 +65,7 @@ class SocketServer:
                 try:
 
                     client_socket, client_address = self.server_socket.accept()
+                    client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
                     self.logger.debug(f"Accepted connection from {client_address}")
 
                     client_thread = threading.Thread(
@@ -94,18 +96,28 @@ class SocketServer:
 
         try:
 
-            message = self._receive_message(client_socket)
+            while self.running:
+                message = self._receive_message(client_socket)
 
-            if message:
-                self.logger.debug(f"Received message from {client_address}: {message.get('type')}")
+                if not message:
+                    break
 
+                self.logger.debug(f"Received message from {client_address}: {message.get('type')}")
 
                 response = self.message_handler(message)
 
+                # The client of a request is blocked reading, so a handler with nothing to say still answers
+                if response is None and MessageProtocol.expects_response(message):
+                    response = MessageProtocol.create_ack(sender_id=0)
+
                 if response:
                     self._send_message(client_socket, response)
                     self.logger.debug(f"Sent response to {client_address}")
 
+        except socket.timeout:
+
+            self.logger.debug(f"Closing idle connection from {client_address}")
+
         except ValueError as e:
             self.logger.error(f"Invalid message from {client_address}: {e}")
 
@@ -119,9 +131,9 @@ class SocketServer:
             except Exception:
                 pass
 
-        except BrokenPipeError:
+        except (BrokenPipeError, ConnectionResetError):
 
-            self.logger.debug(f"Client {client_address} disconnected (broken pipe)")
+            self.logger.debug(f"Client {client_address} disconnected")
 
         except Exception as e:
             self.logger.error(f"Error handling client {client_address}: {e}")
@@ -134,7 +146,7 @@ class SocketServer:
 
     def _receive_message(self, sock: socket.socket) -> Optional[Dict[str, Any]]:
 
-        length_data = self._receive_exact(sock, 4)
+        length_data = self._receive_exact(sock, 4, self.idle_timeout)
         if not length_data or len(length_data) < 4:
             return None
 
@@ -156,17 +168,12 @@ class SocketServer:
 
     def _send_message(self, sock: socket.socket, message: Dict[str, Any]):
 
-        encoded_message = MessageProtocol.encode_message(message)
-        message_length = len(encoded_message)
-
-        sock.sendall(message_length.to_bytes(4, byteorder='big'))
-
-        sock.sendall(encoded_message)
+        sock.sendall(MessageProtocol.frame(message))
 
-    def _receive_exact(self, sock: socket.socket, num_bytes: int) -> bytes:
+    def _receive_exact(self, sock: socket.socket, num_bytes: int, timeout: float = 5.0) -> bytes:
 
         data = b''
-        sock.settimeout(5.0)  
+        sock.settimeout(timeout)
 
         while len(data) < num_bytes:
             chunk = sock.recv(min(num_bytes - len(data), self.buffer_size))
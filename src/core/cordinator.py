@@ -1,4 +1,5 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 from src.communication.socket_client import SocketClient
 from src.database.query_executor import QueryExecutor
@@ -20,7 +21,8 @@ class Coordinator:
         two_pc_coordinator: TwoPhaseCommitCoordinator,
         transaction_manager: TransactionManager,
         load_balancer: LoadBalancer,
-        health_checker
+        health_checker,
+        replication_wait_for_ack: bool = True
     ):
 
         self.node_id = node_id
@@ -31,7 +33,12 @@ class Coordinator:
         self.transaction_manager = transaction_manager
         self.load_balancer = load_balancer
         self.health_checker = health_checker
+        self.replication_wait_for_ack = replication_wait_for_ack
         self.logger = logging.getLogger(__name__)
+        self._executor = ThreadPoolExecutor(
+            max_workers=4,
+            thread_name_prefix=f"coordinator_{node_id}"
+        )
 
         self.is_active = False
 
@@ -151,7 +158,7 @@ class Coordinator:
 
             if selected_node_id == self.node_id:
 
-                result = self.query_executor.execute(query, transaction_id)
+                result = self.query_executor.execute(query, transaction_id).to_dict()
             else:
 
                 selected_node = next(n for n in all_nodes if n['id'] == selected_node_id)
@@ -227,22 +234,29 @@ class Coordinator:
         self.logger.info(f"Distributing write query to all nodes")
 
         available_node_ids = self.health_checker.get_available_nodes()
-        target_nodes = [n for n in all_nodes if n['id'] in available_node_ids]
 
-        result = self.replication_manager.replicate_query(
+        if len(available_node_ids) == self.replication_manager.peer_count:
+            target_nodes = None
+        else:
+            target_nodes = [n for n in all_nodes if n['id'] in available_node_ids]
+
+        replication_future = self._executor.submit(
+            self.replication_manager.replicate_query,
             query=query,
             transaction_id=transaction_id,
             target_nodes=target_nodes,
-            wait_for_ack=True
+            wait_for_ack=self.replication_wait_for_ack
         )
 
         local_result = self.query_executor.execute(query, transaction_id)
+        result = replication_future.result()
 
         return {
-            'success': result['success'] and local_result['success'],
+            'success': result['success'] and local_result.success,
+            'pending': result['pending'],
             'transaction_id': transaction_id,
             'replication': result,
-            'local': local_result
+            'local': local_result.to_dict()
         }
 
     def get_coordinator_status(self) -> Dict[str, Any]:
@@ -1,5 +1,5 @@
 import logging
-import time
+import threading
 from typing import Dict, Any, Optional, Callable
 from src.communication.socket_client import SocketClient
 from src.communication.protocol import MessageProtocol
@@ -25,6 +25,7 @@ class BullyElection:
         self.coordinator_id: Optional[int] = None
         self.election_timeout = 10  # seconds
         self.response_timeout = 3  # seconds
+        self._announcement = threading.Event()
 
     def start_election(self, all_nodes: list) -> Optional[int]:
 
@@ -34,6 +35,7 @@ class BullyElection:
 
         self.logger.info(f"Node {self.node_id} starting election")
         self.election_in_progress = True
+        self._announcement.clear()
 
         try:
 
@@ -130,7 +132,7 @@ class BullyElection:
 
         self.logger.info("Waiting for coordinator announcement...")
 
-        time.sleep(self.election_timeout)
+        self._announcement.wait(self.election_timeout)
 
         if self.coordinator_id is None:
             self.logger.warning("No coordinator announcement received")
@@ -152,7 +154,6 @@ class BullyElection:
 
         if not self.election_in_progress:
 
-            import threading
             election_thread = threading.Thread(
                 target=self.start_election,
                 args=(all_nodes,),
@@ -168,6 +169,7 @@ class BullyElection:
 
         old_coordinator = self.coordinator_id
         self.coordinator_id = coordinator_id
+        self._announcement.set()
 
         if self.on_coordinator_elected and old_coordinator != coordinator_id:
             try:
@@ -1,4 +1,6 @@
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional
 from src.communication.socket_server import SocketServer
 from src.communication.socket_client import SocketClient
@@ -21,6 +23,15 @@ from src.utils.logger import setup_logger
 
 class Node:
 
+    __slots__ = (
+        'node_id', 'config', 'logger', 'node_config', 'all_nodes', 'db_config',
+        'heartbeat_config', 'replication_config', 'socket_client', 'socket_server', 'db_connector',
+        'query_executor', 'replication_manager', 'lock_manager', 'transaction_manager',
+        'two_pc_coordinator', 'two_pc_participant', 'load_balancer', 'health_checker',
+        'heartbeat_monitor', 'election', 'coordinator', '_nodes_by_id', '_handlers',
+        '_init_executor', '_init_futures', '_init_lock'
+    )
+
     def __init__(self, node_id: int, config: Config):
 
         self.node_id = node_id
@@ -33,17 +44,55 @@ class Node:
         self.all_nodes = config.get_all_nodes()
         self.db_config = config.load_database_config()
         self.heartbeat_config = config.get_heartbeat_config()
+        self.replication_config = config.get_replication_config()
 
         if not self.node_config:
             raise ValueError(f"Configuration not found for node {node_id}")
 
+        self._nodes_by_id = {node['id']: node for node in self.all_nodes}
+        self._handlers = {
+            message_types.HEARTBEAT: self._handle_heartbeat,
+            message_types.QUERY: self._handle_query,
+            message_types.REPLICATION: self._handle_replication,
+            message_types.REPLICATION_ACK_BATCH: self._handle_replication_ack_batch,
+            message_types.ELECTION: self._handle_election,
+            message_types.COORDINATOR_ANNOUNCEMENT: self._handle_coordinator_announcement,
+            message_types.TRANSACTION_PREPARE: self._handle_transaction_prepare,
+            message_types.TRANSACTION_COMMIT: self._handle_transaction_commit,
+            message_types.TRANSACTION_ABORT: self._handle_transaction_abort
+        }
+
         self._init_communication()
         self._init_database()
-        self._init_transactions()
-        self._init_monitoring()
-        self._init_core()
 
-        self.logger.info(f"Node {node_id} initialized successfully")
+        self._init_lock = threading.Lock()
+        self._init_executor = ThreadPoolExecutor(
+            max_workers=3,
+            thread_name_prefix=f"node_{node_id}_init"
+        )
+        self._init_futures = {}
+        self._init_futures['transactions'] = self._init_executor.submit(self._init_transactions)
+        self._init_futures['monitoring'] = self._init_executor.submit(self._init_monitoring)
+        self._init_futures['core'] = self._init_executor.submit(self._init_core)
+
+    def _wait_for_init(self):
+
+        if self._init_executor is None:
+            return
+
+        # Request threads may race here; only one waits on the futures and shuts down
+        with self._init_lock:
+            executor = self._init_executor
+            if executor is None:
+                return
+
+            for future in self._init_futures.values():
+                future.result()
+
+            executor.shutdown(wait=False)
+            self._init_executor = None
+
+        self.logger.info(f"Node {self.node_id} initialized successfully")
 
     def _init_communication(self):
 
@@ -80,6 +129,8 @@ class Node:
             node_id=self.node_id,
             socket_client=self.socket_client
         )
+        self.replication_manager.pipeline_enabled = self.replication_config['pipeline']
+        self.replication_manager.set_peers(self.all_nodes)
 
     def _init_transactions(self):
 
@@ -126,15 +177,21 @@ class Node:
             socket_client=self.socket_client,
             heartbeat_interval=self.heartbeat_config['heartbeat_interval'],
             heartbeat_timeout=self.heartbeat_config['heartbeat_timeout'],
-            failure_callback=self.health_checker.handle_node_failure
+            failure_callback=self.health_checker.handle_node_failure,
+            status_callback=self.health_checker.handle_node_status
         )
 
         self.health_checker.heartbeat_monitor = self.heartbeat_monitor
 
     def _init_core(self):
 
+        self._init_futures['transactions'].result()
+        self._init_futures['monitoring'].result()
+
         self.logger.info("Initializing core components...")
 
+        self.replication_manager.heartbeat_monitor = self.heartbeat_monitor
+
         self.election = BullyElection(
             node_id=self.node_id,
             socket_client=self.socket_client,
@@ -149,7 +206,8 @@ class Node:
             two_pc_coordinator=self.two_pc_coordinator,
             transaction_manager=self.transaction_manager,
             load_balancer=self.load_balancer,
-            health_checker=self.health_checker
+            health_checker=self.health_checker,
+            replication_wait_for_ack=self.replication_config['wait_for_ack']
         )
 
         initial_coordinator = max(node['id'] for node in self.all_nodes)
@@ -163,8 +221,9 @@ class Node:
 
         self.logger.info(f"Starting node {self.node_id}...")
 
-        if not self.db_connector.test_connection():
-            raise RuntimeError("Failed to connect to database")
+        self._wait_for_init()
+
+        threading.Thread(target=self._probe_database, daemon=True).start()
 
         self.socket_server.start()
 
@@ -173,14 +232,29 @@ class Node:
         self.logger.info(f"Node {self.node_id} started successfully")
         self.logger.info(f"Listening on port {self.node_config['port']}")
 
+    def _probe_database(self):
+
+        if not self.db_connector.test_connection():
+            self.logger.error("Database is unreachable; queries will fail until it recovers")
+
     def stop(self):
 
         self.logger.info(f"Stopping node {self.node_id}...")
 
+        self._wait_for_init()
+
         self.heartbeat_monitor.stop()
 
         self.socket_server.stop()
 
+        self.socket_client.close()
+
+        self.replication_manager.close()
+
+        self.two_pc_coordinator.close()
+
+        self.query_executor.close()
+
         self.db_connector.close_pool()
 
         if self.coordinator.is_active:
@@ -196,26 +270,14 @@ class Node:
 
             self.logger.debug(f"Handling {message_type} message from node {sender_id}")
 
-            if message_type == message_types.HEARTBEAT:
-                return self._handle_heartbeat(message)
-            elif message_type == message_types.QUERY:
-                return self._handle_query(message)
-            elif message_type == message_types.REPLICATION:
-                return self._handle_replication(message)
-            elif message_type == message_types.ELECTION:
-                return self._handle_election(message)
-            elif message_type == message_types.COORDINATOR_ANNOUNCEMENT:
-                return self._handle_coordinator_announcement(message)
-            elif message_type == message_types.TRANSACTION_PREPARE:
-                return self._handle_transaction_prepare(message)
-            elif message_type == message_types.TRANSACTION_COMMIT:
-                return self._handle_transaction_commit(message)
-            elif message_type == message_types.TRANSACTION_ABORT:
-                return self._handle_transaction_abort(message)
-            else:
+            handler = self._handlers.get(message_type)
+
+            if handler is None:
                 self.logger.warning(f"Unknown message type: {message_type}")
                 return None
 
+            return handler(message)
+
         except Exception as e:
             self.logger.error(f"Error handling message: {e}")
             return MessageProtocol.create_response(
@@ -240,7 +302,7 @@ class Node:
         from_coordinator = data.get('from_coordinator', False)
 
         if from_coordinator:
-            result = self.query_executor.execute(query, transaction_id)
+            result = self.query_executor.execute(query, transaction_id).to_dict()
         else:
             result = self.execute_query(query)
 
@@ -250,20 +312,38 @@ class Node:
             data=result
         )
 
-    def _handle_replication(self, message: Dict[str, Any]) -> Dict[str, Any]:
+    def _handle_replication(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
 
         data = MessageProtocol.get_message_data(message)
         query = data.get('query')
         transaction_id = data.get('transaction_id')
         sender_id = message.get('sender_id')
 
+        if 'entries' in data:
+            return self.replication_manager.handle_replication_batch(
+                entries=data['entries'],
+                sender_id=sender_id,
+                query_executor=self.query_executor
+            )
+
         return self.replication_manager.handle_replication_request(
             query=query,
             transaction_id=transaction_id,
             sender_id=sender_id,
-            query_executor=self.query_executor
+            query_executor=self.query_executor,
+            ack_batched=data.get('ack_batched', False)
         )
 
+    def _handle_replication_ack_batch(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+
+        data = MessageProtocol.get_message_data(message)
+        self.replication_manager.handle_ack_batch(
+            sender_id=message.get('sender_id'),
+            transaction_ids=data.get('transaction_ids', [])
+        )
+
+        return None
+
     def _handle_election(self, message: Dict[str, Any]) -> Dict[str, Any]:
 
         sender_id = message.get('sender_id')
@@ -316,6 +396,8 @@ class Node:
 
     def execute_query(self, query: str) -> Dict[str, Any]:
 
+        self._wait_for_init()
+
         if self.coordinator.is_active:
 
             return self.coordinator.handle_query(query, self.all_nodes)
@@ -329,10 +411,7 @@ class Node:
                     'error': 'No coordinator available'
                 }
 
-            coordinator_node = next(
-                (n for n in self.all_nodes if n['id'] == coordinator_id),
-                None
-            )
+            coordinator_node = self._nodes_by_id.get(coordinator_id)
 
             if not coordinator_node:
                 return {
@@ -375,6 +454,8 @@ class Node:
 
     def get_status(self) -> Dict[str, Any]:
 
+        self._wait_for_init()
+
         return {
             'node_id': self.node_id,
             'is_coordinator': self.election.is_coordinator(),
@@ -382,5 +463,6 @@ class Node:
             'heartbeat': self.heartbeat_monitor.get_status(),
             'health': self.health_checker.get_health_stats(),
             'load_balancer': self.load_balancer.get_statistics(),
+            'query_log': self.query_executor.get_log_stats(),
             'transactions': self.transaction_manager.get_active_transactions()
         }
@@ -1,12 +1,17 @@
 import logging
 import mysql.connector
 from mysql.connector import pooling, Error
-from typing import Any, List, Tuple, Optional, Dict
+from typing import Any, List, Tuple, Optional, Dict, Union
 import os
 
 
 class MySQLConnector:
 
+    __slots__ = (
+        'host', 'port', 'database', 'user', 'password', 'pool_name',
+        'pool_size', 'logger', 'connection_pool'
+    )
+
     def __init__(
         self,
         host: str,
@@ -55,15 +60,40 @@ class MySQLConnector:
     def get_connection(self):
 
         try:
-            return self.connection_pool.get_connection()
+            connection = self.connection_pool.get_connection()
+
+            if not connection.is_connected():
+                connection.reconnect(attempts=1, delay=0)
+
+            return connection
         except Error as e:
             self.logger.error(f"Error getting connection from pool: {e}")
             raise
 
+    def create_connection(self, **overrides):
+
+        settings = {
+            'host': self.host,
+            'port': self.port,
+            'database': self.database,
+            'user': self.user,
+            'password': self.password,
+            'charset': 'utf8mb4',
+            'autocommit': False,
+            'connect_timeout': 10
+        }
+        settings.update(overrides)
+
+        try:
+            return mysql.connector.connect(**settings)
+        except Error as e:
+            self.logger.error(f"Error creating dedicated connection: {e}")
+            raise
+
     def execute_query(
         self,
         query: str,
-        params: Tuple = None,
+        params: Union[Tuple, List[Tuple]] = None,
         fetch: bool = True
     ) -> Tuple[bool, Any]:
 
@@ -72,19 +102,30 @@ class MySQLConnector:
 
         try:
             connection = self.get_connection()
-            cursor = connection.cursor(dictionary=True)
-
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
 
             if fetch:
+                cursor = connection.cursor(dictionary=True)
+
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+
                 result = cursor.fetchall()
                 return True, result
+
+            # Writes return no rows, so a plain cursor avoids the dict row packing
+            cursor = connection.cursor()
+
+            if isinstance(params, list):
+                cursor.executemany(query, params)
+            elif params:
+                cursor.execute(query, params)
             else:
-                connection.commit()
-                return True, cursor.rowcount
+                cursor.execute(query)
+
+            connection.commit()
+            return True, cursor.rowcount
 
         except Error as e:
             self.logger.error(f"Database error executing query: {e}")
@@ -1,7 +1,94 @@
+import hashlib
+import itertools
 import logging
-from typing import Dict, Any, Tuple, Optional
+import queue
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple, Optional
 from src.database.mysql_connector import MySQLConnector
-from src.utils.helpers import parse_query_type, get_timestamp, generate_transaction_id
+from src.utils.helpers import parse_query_type, format_timestamp_ns
+
+
+LOG_INSERT_QUERY = """
+    INSERT INTO transactions_log
+    (transaction_id, query_type, stmt_id, status, node_id, created_at)
+    VALUES (%s, %s, %s, %s, %s, NOW())
+"""
+
+LOG_INSERT_QUERY_BYTES = LOG_INSERT_QUERY.encode('utf-8')
+
+STMT_INSERT_QUERY = """
+    INSERT INTO statement_dictionary (stmt_hash, query_text)
+    VALUES (%s, %s)
+    ON DUPLICATE KEY UPDATE stmt_id = LAST_INSERT_ID(stmt_id)
+"""
+
+LOG_SELECT_COLUMNS = """
+    SELECT l.id, l.transaction_id, l.query_type, l.stmt_id, d.query_text,
+           l.status, l.node_id, l.created_at
+    FROM transactions_log l
+    LEFT JOIN statement_dictionary d ON d.stmt_id = l.stmt_id
+"""
+
+LOG_SELECT_BY_TRANSACTION = LOG_SELECT_COLUMNS + """
+    WHERE l.transaction_id = %s
+    ORDER BY l.created_at DESC
+    LIMIT %s
+"""
+
+LOG_SELECT_BY_NODE = LOG_SELECT_COLUMNS + """
+    WHERE l.node_id = %s
+    ORDER BY l.created_at DESC
+    LIMIT %s
+"""
+
+_LOG_STOP = object()
+
+_FETCH_TYPES = frozenset({'SELECT'})
+_STATUS_OK = 'COMMITTED'
+_STATUS_FAIL = 'FAILED'
+
+
+@lru_cache(maxsize=4096)
+def _cached_query_type(query: str) -> str:
+
+    return parse_query_type(query)
+
+
+@dataclass(slots=True)
+class ExecResult:
+    success: bool
+    transaction_id: str
+    query_type: str
+    node_id: int
+    timestamp_ns: int
+    data: Optional[List[Dict[str, Any]]] = None
+    row_count: Optional[int] = None
+    affected_rows: Optional[int] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+
+        result = {
+            'success': self.success,
+            'transaction_id': self.transaction_id,
+            'query_type': self.query_type,
+            'node_id': self.node_id,
+            'timestamp': format_timestamp_ns(self.timestamp_ns)
+        }
+
+        if self.data is not None:
+            result['data'] = self.data
+            result['row_count'] = self.row_count
+        if self.affected_rows is not None:
+            result['affected_rows'] = self.affected_rows
+        if self.error is not None:
+            result['error'] = self.error
+
+        return result
 
 
 class QueryExecutor:
@@ -12,62 +99,82 @@ class QueryExecutor:
         self.node_id = node_id
         self.logger = logging.getLogger(__name__)
 
+        self._txn_counter = itertools.count(time.time_ns())
+
+        self.log_batch_size = 64
+        self.stmt_cache_size = 10000
+        self._stmt_dict: Dict[str, int] = {}
+        self._log_connection = None
+        self._log_lock = threading.Lock()
+        self._log_cursors = weakref.WeakKeyDictionary()
+        self.log_put_timeout = 0.5
+        self._log_dropped = 0
+        # Separate from _log_lock, which is held across MySQL writes
+        self._log_dropped_lock = threading.Lock()
+        self._log_q: queue.Queue = queue.Queue(maxsize=10000)
+        self._log_thread = threading.Thread(target=self._log_worker, daemon=True)
+        self._log_thread.start()
+
     def execute(
         self,
         query: str,
         transaction_id: str = None,
-        log_query: bool = True
-    ) -> Dict[str, Any]:
+        log_query: bool = True,
+        *,
+        query_type: Optional[str] = None,
+        durable_log: bool = False
+    ) -> ExecResult:
 
         if not transaction_id:
-            transaction_id = generate_transaction_id()
+            transaction_id = f"TXN-{self.node_id}-{next(self._txn_counter)}"
 
-        query_type = parse_query_type(query)
+        if query_type is None:
+            query_type = _cached_query_type(query)
         self.logger.info(f"Executing {query_type} query: {query[:100]}...")
 
-        fetch_results = query_type == 'SELECT'
+        fetch_results = query_type in _FETCH_TYPES
 
         success, result = self.db.execute_query(query, fetch=fetch_results)
 
-        response = {
-            'success': success,
-            'transaction_id': transaction_id,
-            'query_type': query_type,
-            'node_id': self.node_id,
-            'timestamp': get_timestamp()
-        }
+        response = ExecResult(
+            success=success,
+            transaction_id=transaction_id,
+            query_type=query_type,
+            node_id=self.node_id,
+            timestamp_ns=time.time_ns()
+        )
 
         if success:
             if fetch_results:
-                response['data'] = result
-                response['row_count'] = len(result)
+                response.data = result
+                response.row_count = len(result)
             else:
-                response['affected_rows'] = result
-            status = 'COMMITTED'
+                response.affected_rows = result
+            status = _STATUS_OK
         else:
-            response['error'] = result
-            status = 'FAILED'
+            response.error = result
+            status = _STATUS_FAIL
 
-        if log_query:
-            self._log_query(transaction_id, query_type, query, status)
+        if log_query and not fetch_results:
+            self._log_query(transaction_id, query_type, query, status, durable=durable_log)
 
         return response
 
-    def execute_select(self, query: str, transaction_id: str = None) -> Dict[str, Any]:
+    def execute_select(self, query: str, transaction_id: str = None) -> ExecResult:
 
-        return self.execute(query, transaction_id, log_query=True)
+        return self.execute(query, transaction_id, log_query=True, query_type='SELECT')
 
-    def execute_insert(self, query: str, transaction_id: str = None) -> Dict[str, Any]:
+    def execute_insert(self, query: str, transaction_id: str = None) -> ExecResult:
 
-        return self.execute(query, transaction_id, log_query=True)
+        return self.execute(query, transaction_id, log_query=True, query_type='INSERT')
 
-    def execute_update(self, query: str, transaction_id: str = None) -> Dict[str, Any]:
+    def execute_update(self, query: str, transaction_id: str = None) -> ExecResult:
 
-        return self.execute(query, transaction_id, log_query=True)
+        return self.execute(query, transaction_id, log_query=True, query_type='UPDATE')
 
-    def execute_delete(self, query: str, transaction_id: str = None) -> Dict[str, Any]:
+    def execute_delete(self, query: str, transaction_id: str = None) -> ExecResult:
 
-        return self.execute(query, transaction_id, log_query=True)
+        return self.execute(query, transaction_id, log_query=True, query_type='DELETE')
 
     def prepare_query(
         self,
@@ -75,28 +182,26 @@ class QueryExecutor:
         transaction_id: str
     ) -> Tuple[bool, Optional[str]]:
 
-        query_type = parse_query_type(query)
+        query_type = _cached_query_type(query)
         self.logger.info(f"Preparing {query_type} query for transaction {transaction_id}")
 
-        try:
-            self._log_query(transaction_id, query_type, query, 'PREPARED')
-
+        # The PREPARED record must be on disk before this participant votes YES
+        if self._log_query(transaction_id, query_type, query, 'PREPARED', durable=True):
             return True, None
 
-        except Exception as e:
-            error_msg = f"Failed to prepare query: {e}"
-            self.logger.error(error_msg)
-            self._log_query(transaction_id, query_type, query, 'PREPARE_FAILED')
-            return False, error_msg
+        error_msg = f"Failed to prepare query: could not persist PREPARED record for {transaction_id}"
+        self.logger.error(error_msg)
+        self._log_query(transaction_id, query_type, query, 'PREPARE_FAILED')
+        return False, error_msg
 
     def commit_prepared_query(
         self,
         query: str,
         transaction_id: str
-    ) -> Dict[str, Any]:
+    ) -> ExecResult:
 
         self.logger.info(f"Committing prepared query for transaction {transaction_id}")
-        return self.execute(query, transaction_id, log_query=True)
+        return self.execute(query, transaction_id, log_query=True, durable_log=True)
 
     def abort_prepared_query(
         self,
@@ -104,7 +209,7 @@ class QueryExecutor:
         transaction_id: str
     ):
         
-        query_type = parse_query_type(query)
+        query_type = _cached_query_type(query)
         self.logger.info(f"Aborting prepared query for transaction {transaction_id}")
         self._log_query(transaction_id, query_type, query, 'ABORTED')
 
@@ -113,26 +218,154 @@ class QueryExecutor:
         transaction_id: str,
         query_type: str,
         query_text: str,
-        status: str
-    ):
-        
+        status: str,
+        durable: bool = False
+    ) -> bool:
+
+        row = (transaction_id, query_type, query_text, status, self.node_id)
+
+        if durable:
+            return self._write_log_rows([row])
+
         try:
-            log_query = """
-                INSERT INTO transactions_log
-                (transaction_id, query_type, query_text, status, node_id, created_at)
-                VALUES (%s, %s, %s, %s, %s, NOW())
-            """
-            params = (transaction_id, query_type, query_text, status, self.node_id)
-
-            connection = self.db.get_connection()
+            self._log_q.put(row, timeout=self.log_put_timeout)
+            return True
+        except queue.Full:
+            with self._log_dropped_lock:
+                self._log_dropped += 1
+                dropped = self._log_dropped
+            self.logger.error(
+                f"Log queue full, dropped {status} entry for transaction {transaction_id} "
+                f"({dropped} dropped so far)"
+            )
+            return False
+
+    def _log_worker(self):
+
+        running = True
+
+        while running:
+            rows = []
+            item = self._log_q.get()
+
+            while True:
+                if item is _LOG_STOP:
+                    running = False
+                else:
+                    rows.append(item)
+
+                if not running or len(rows) >= self.log_batch_size:
+                    break
+
+                try:
+                    item = self._log_q.get_nowait()
+                except queue.Empty:
+                    break
+
+            if rows:
+                self._write_log_rows(rows)
+
+            for _ in range(len(rows) + (0 if running else 1)):
+                self._log_q.task_done()
+
+    def flush_log(self):
+
+        if self._log_thread.is_alive():
+            self._log_q.join()
+
+    def get_log_stats(self) -> Dict[str, Any]:
+
+        return {
+            'queued': self._log_q.qsize(),
+            'dropped': self._log_dropped
+        }
+
+    def close(self):
+
+        if self._log_thread.is_alive():
+            self._log_q.put(_LOG_STOP)
+            self._log_thread.join(timeout=5)
+
+        self._close_log_connection()
+
+    def _write_log_rows(self, rows: List[Tuple]) -> bool:
+
+        with self._log_lock:
+            for attempt in range(2):
+                try:
+                    self._insert_log_rows(rows)
+                    return True
+                except Exception as e:
+                    self._drop_log_connection()
+                    if attempt:
+                        with self._log_dropped_lock:
+                            self._log_dropped += len(rows)
+                        self.logger.error(f"Failed to log {len(rows)} queries: {e}")
+                    else:
+                        self.logger.warning(f"Log connection failed, reconnecting: {e}")
+
+        return False
+
+    def _insert_log_rows(self, rows: List[Tuple]):
+
+        if self._log_connection is None:
+            self._log_connection = self.db.create_connection(autocommit=True)
+
+        connection = self._log_connection
+        new_stmts = {}
+        rows = [
+            (transaction_id, query_type, self._resolve_stmt_id(connection, query_text, new_stmts), status, node_id)
+            for transaction_id, query_type, query_text, status, node_id in rows
+        ]
+
+        if len(rows) == 1:
+            cursor = self._log_cursors.get(connection)
+            if cursor is None:
+                cursor = connection.cursor(prepared=True)
+                self._log_cursors[connection] = cursor
+            cursor.execute(LOG_INSERT_QUERY_BYTES, rows[0])
+        else:
             cursor = connection.cursor()
-            cursor.execute(log_query, params)
-            connection.commit()
+            cursor.executemany(LOG_INSERT_QUERY, rows)
             cursor.close()
-            connection.close()
 
-        except Exception as e:
-            self.logger.error(f"Failed to log query: {e}")
+        if len(self._stmt_dict) + len(new_stmts) > self.stmt_cache_size:
+            self._stmt_dict.clear()
+        self._stmt_dict.update(new_stmts)
+
+    def _resolve_stmt_id(self, connection, query_text: str, new_stmts: Dict[str, int]) -> int:
+
+        stmt_id = self._stmt_dict.get(query_text)
+        if stmt_id is None:
+            stmt_id = new_stmts.get(query_text)
+
+        if stmt_id is None:
+            stmt_hash = hashlib.sha256(query_text.encode('utf-8')).hexdigest()
+            cursor = connection.cursor()
+            try:
+                cursor.execute(STMT_INSERT_QUERY, (stmt_hash, query_text))
+                stmt_id = cursor.lastrowid
+            finally:
+                cursor.close()
+            new_stmts[query_text] = stmt_id
+
+        return stmt_id
+
+    def _close_log_connection(self):
+
+        with self._log_lock:
+            self._drop_log_connection()
+
+    def _drop_log_connection(self):
+
+        connection = self._log_connection
+        self._log_connection = None
+
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
 
     def get_transaction_log(
         self,
@@ -140,22 +373,14 @@ class QueryExecutor:
         limit: int = 100
     ) -> Dict[str, Any]:
 
+        self.flush_log()
+
         try:
             if transaction_id:
-                query = """
-                    SELECT * FROM transactions_log
-                    WHERE transaction_id = %s
-                    ORDER BY created_at DESC
-                    LIMIT %s
-                """
+                query = LOG_SELECT_BY_TRANSACTION
                 params = (transaction_id, limit)
             else:
-                query = """
-                    SELECT * FROM transactions_log
-                    WHERE node_id = %s
-                    ORDER BY created_at DESC
-                    LIMIT %s
-                """
+                query = LOG_SELECT_BY_NODE
                 params = (self.node_id, limit)
 
             success, result = self.db.execute_query(query, params, fetch=True)
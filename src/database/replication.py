@@ -1,10 +1,34 @@
+import itertools
 import logging
+import queue
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from typing import Dict, Any, List, Optional
 from src.communication.socket_client import SocketClient
 from src.communication.protocol import MessageProtocol
 from src.communication import message_types
 
 
+class _PeerPipeline:
+
+    __slots__ = ('node', 'pending', 'in_flight', 'rtt_samples')
+
+    def __init__(self, node: Dict[str, Any]):
+
+        self.node = node
+        self.pending: List[tuple] = []
+        self.in_flight = 0
+        self.rtt_samples: deque = deque(maxlen=8)
+
+    def flush_interval(self) -> float:
+
+        if not self.rtt_samples:
+            return 0.0
+        return 0.5 * sum(self.rtt_samples) / len(self.rtt_samples)
+
+
 class ReplicationManager:
 
     def __init__(self, node_id: int, socket_client: SocketClient):
@@ -12,88 +36,458 @@ class ReplicationManager:
         self.node_id = node_id
         self.socket_client = socket_client
         self.logger = logging.getLogger(__name__)
-        self.replication_log = [] 
+        self.replication_log_size = 1000
+        self._repl_tx_ids: deque = deque(maxlen=self.replication_log_size)
+        self._repl_query_ids: deque = deque(maxlen=self.replication_log_size)
+        self._repl_success_lists: deque = deque(maxlen=self.replication_log_size)
+        self._repl_fail_lists: deque = deque(maxlen=self.replication_log_size)
+        self._repl_pending_lists: deque = deque(maxlen=self.replication_log_size)
+        self._repl_failed_counts: deque = deque(maxlen=self.replication_log_size)
+        self._repl_timestamps: deque = deque(maxlen=self.replication_log_size)
+        self._repl_index: Dict[str, int] = {}
+        self._repl_seq = 0
+        self._success_count = 0
+        self._fail_count = 0
+        # Statement texts live as long as some retained log entry references them
+        self._stmt_ids: Dict[str, int] = {}
+        self._stmt_texts: Dict[int, str] = {}
+        self._stmt_refs: Dict[int, int] = {}
+        self._stmt_counter = itertools.count(1)
+        self._log_lock = threading.Lock()
+        self.replication_timeout = 30  # seconds
+        self._fanout = ThreadPoolExecutor(
+            max_workers=32,
+            thread_name_prefix=f"replication_{node_id}"
+        )
+
+        self.heartbeat_monitor = None
+
+        self._node_addresses: Dict[int, Dict[str, Any]] = {}
+        self._peers: tuple = ()
+        self._peer_count = 0
+        self.ack_flush_interval = 0.002  # seconds
+        self._ack_buffer: Dict[int, List[str]] = defaultdict(list)
+        self._ack_lock = threading.Lock()
+        self._ack_stop = threading.Event()
+        self._ack_thread = None
+
+        self._async_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._async_thread = None
+        self._async_lock = threading.Lock()
+
+        self.pipeline_enabled = False
+        self.pipeline_batch_size = 32
+        self.pipeline_max_in_flight = 2
+        self._pipelines: Dict[int, _PeerPipeline] = {}
+        self._pipeline_cond = threading.Condition()
+        self._pipeline_thread = None
+        self._pipeline_running = False
+
+    def set_peers(self, nodes: List[Dict[str, Any]]):
+
+        self._node_addresses = {node['id']: node for node in nodes}
+        self._peers = tuple(node for node in nodes if node['id'] != self.node_id)
+        self._peer_count = len(self._peers)
+
+    @property
+    def peer_count(self) -> int:
+
+        return self._peer_count
 
     def replicate_query(
         self,
         query: str,
         transaction_id: str,
-        target_nodes: List[Dict[str, Any]],
-        wait_for_ack: bool = True
+        target_nodes: Optional[List[Dict[str, Any]]] = None,
+        wait_for_ack: bool = True,
+        required_acks: Optional[int] = None
     ) -> Dict[str, Any]:
 
-        self.logger.info(f"Replicating query to {len(target_nodes)} nodes for transaction {transaction_id}")
+        if target_nodes is None:
+            peers = self._peers
+        else:
+            peers = [node for node in target_nodes if node['id'] != self.node_id]
+
+        self.logger.info(f"Replicating query to {len(peers)} nodes for transaction {transaction_id}")
 
         replication_message = MessageProtocol.create_replication_message(
             sender_id=self.node_id,
             query=query,
-            transaction_id=transaction_id
+            transaction_id=transaction_id,
+            ack_batched=not wait_for_ack
         )
+        frame = MessageProtocol.frame(replication_message)
+
+        if not wait_for_ack:
+            return self._replicate_async(query, transaction_id, peers, frame)
 
         successful_nodes = []
         failed_nodes = []
+        pending = {}
 
-        for node in target_nodes:
-            node_id = node['id']
-
-            if node_id == self.node_id:
-                continue
-
-            try:
-                response = self.socket_client.send_message(
+        for node in peers:
+            if self.pipeline_enabled:
+                future = self._enqueue_pipelined(node, query, transaction_id)
+            else:
+                future = self._fanout.submit(
+                    self.socket_client.send_raw,
                     host=node['ip'],
                     port=node['port'],
-                    message=replication_message,
-                    wait_for_response=wait_for_ack
+                    frame=frame,
+                    wait_for_response=True
                 )
+            pending[future] = node['id']
 
-                if wait_for_ack:
-                    if response and response.get('type') == message_types.REPLICATION_ACK:
-                        successful_nodes.append(node_id)
-                        self.logger.debug(f"Node {node_id} acknowledged replication")
-                    else:
-                        failed_nodes.append(node_id)
-                        self.logger.warning(f"Node {node_id} failed to acknowledge replication")
-                else:
+        total_targets = len(peers)
+
+        if required_acks is None:
+            required_acks = total_targets // 2 + 1
+        required_acks = min(required_acks, total_targets)
+
+        try:
+            for future in as_completed(list(pending), timeout=self.replication_timeout):
+                node_id = pending.pop(future)
+
+                try:
+                    response = future.result()
+                except Exception as e:
+                    self.logger.error(f"Replication failed for node {node_id}: {e}")
+                    failed_nodes.append(node_id)
+                    continue
+
+                if response and response.get('type') == message_types.REPLICATION_ACK:
                     successful_nodes.append(node_id)
+                    self._note_peer_activity(node_id, acknowledged=True)
+                    self.logger.debug(f"Node {node_id} acknowledged replication")
 
-            except Exception as e:
-                self.logger.error(f"Replication failed for node {node_id}: {e}")
+                    if len(successful_nodes) >= required_acks:
+                        break
+                else:
+                    failed_nodes.append(node_id)
+                    self.logger.warning(f"Node {node_id} failed to acknowledge replication")
+
+        except FuturesTimeoutError:
+            for node_id in pending.values():
+                self.logger.error(f"Replication to node {node_id} timed out")
                 failed_nodes.append(node_id)
+            pending.clear()
 
-        self._log_replication(
+        seq = self._log_replication(
             transaction_id,
             query,
-            successful_nodes,
-            failed_nodes
+            list(successful_nodes),
+            list(failed_nodes),
+            list(pending.values())
         )
 
-        total_targets = len([n for n in target_nodes if n['id'] != self.node_id])
+        # Quorum reached: the remaining peers settle into this attempt's log entry in
+        # the background; binding to seq keeps a later retry under the same id apart
+        for future, node_id in pending.items():
+            future.add_done_callback(
+                lambda done, node_id=node_id: self._settle_straggler(done, seq, node_id)
+            )
+
         success_rate = len(successful_nodes) / total_targets if total_targets > 0 else 1.0
 
         return {
-            'success': len(failed_nodes) == 0,
+            'success': len(successful_nodes) >= required_acks,
+            'pending': False,
             'transaction_id': transaction_id,
             'total_nodes': total_targets,
             'successful_nodes': successful_nodes,
             'failed_nodes': failed_nodes,
+            'pending_nodes': list(pending.values()),
             'success_rate': success_rate
         }
 
-    def handle_replication_request(
+    def _settle_straggler(self, future: Future, seq: int, node_id: int):
+
+        try:
+            response = future.result()
+        except Exception as e:
+            self.logger.error(f"Replication failed for node {node_id}: {e}")
+            self._mark_failed(seq, node_id)
+            return
+
+        if response and response.get('type') == message_types.REPLICATION_ACK:
+            self._mark_acked(seq, node_id)
+        else:
+            self.logger.warning(f"Node {node_id} failed to acknowledge replication")
+            self._mark_failed(seq, node_id)
+
+    def _replicate_async(
         self,
         query: str,
         transaction_id: str,
+        peers,
+        frame: bytes
+    ) -> Dict[str, Any]:
+
+        # Replicas confirm later through REPLICATION_ACK_BATCH, so every peer starts pending
+        pending_nodes = [node['id'] for node in peers]
+        seq = self._log_replication(transaction_id, query, [], [], list(pending_nodes))
+
+        self._ensure_async_worker()
+        for node in peers:
+            self._async_queue.put((seq, node, frame))
+
+        # Accepted, not yet confirmed: success stays boolean and pending marks the difference
+        return {
+            'success': True,
+            'pending': True,
+            'transaction_id': transaction_id,
+            'total_nodes': len(peers),
+            'successful_nodes': [],
+            'failed_nodes': [],
+            'pending_nodes': pending_nodes,
+            'success_rate': None
+        }
+
+    def _ensure_async_worker(self):
+
+        if self._async_thread is not None:
+            return
+
+        with self._async_lock:
+            if self._async_thread is None:
+                thread = threading.Thread(target=self._async_worker, daemon=True)
+                thread.start()
+                self._async_thread = thread
+
+    def _async_worker(self):
+
+        running = True
+
+        while running:
+            items = [self._async_queue.get()]
+            while True:
+                try:
+                    items.append(self._async_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            by_node: Dict[int, list] = {}
+            for item in items:
+                if item is None:
+                    running = False
+                    continue
+                by_node.setdefault(item[1]['id'], []).append(item)
+
+            for node_id, node_items in by_node.items():
+                node = node_items[0][1]
+
+                try:
+                    self.socket_client.send_oneway(
+                        host=node['ip'],
+                        port=node['port'],
+                        frame=b''.join(item[2] for item in node_items)
+                    )
+                    self._note_peer_activity(node_id, acknowledged=False)
+                except Exception as e:
+                    self.logger.error(f"Async replication to node {node_id} failed: {e}")
+                    for seq, _, _ in node_items:
+                        self._mark_failed(seq, node_id)
+
+    def _position(self, seq: int) -> Optional[int]:
+
+        # Ring position of a log entry, or None once it has been evicted; caller holds _log_lock
+        position = seq - (self._repl_seq - len(self._repl_tx_ids))
+        return position if position >= 0 else None
+
+    def _mark_acked(self, seq: int, node_id: int):
+
+        with self._log_lock:
+            position = self._position(seq)
+            if position is None:
+                return
+
+            self._settle_pending(position, node_id)
+            successful_nodes = self._repl_success_lists[position]
+            if node_id not in successful_nodes:
+                successful_nodes.append(node_id)
+
+    def _mark_failed(self, seq: int, node_id: int):
+
+        with self._log_lock:
+            position = self._position(seq)
+            if position is None:
+                return
+
+            self._settle_pending(position, node_id)
+            self._repl_fail_lists[position].append(node_id)
+
+            if not self._repl_failed_counts[position]:
+                self._success_count -= 1
+                self._fail_count += 1
+            self._repl_failed_counts[position] += 1
+
+    def _settle_pending(self, position: int, node_id: int):
+
+        pending_nodes = self._repl_pending_lists[position]
+        if node_id in pending_nodes:
+            pending_nodes.remove(node_id)
+
+    def _note_peer_activity(self, node_id: int, acknowledged: bool):
+
+        heartbeat_monitor = self.heartbeat_monitor
+        if heartbeat_monitor is None:
+            return
+
+        heartbeat_monitor.note_sent(node_id)
+        if acknowledged:
+            heartbeat_monitor.note_activity(node_id)
+
+    def _note_sender_activity(self, sender_id: int):
+
+        if self.heartbeat_monitor is not None:
+            self.heartbeat_monitor.note_activity(sender_id)
+
+    def _enqueue_pipelined(self, node: Dict[str, Any], query: str, transaction_id: str) -> Future:
+
+        future = Future()
+
+        with self._pipeline_cond:
+            pipeline = self._pipelines.get(node['id'])
+            if pipeline is None:
+                pipeline = self._pipelines[node['id']] = _PeerPipeline(node)
+
+            pipeline.pending.append((transaction_id, query, future, time.monotonic()))
+
+            if self._pipeline_thread is None:
+                self._pipeline_running = True
+                self._pipeline_thread = threading.Thread(target=self._pipeline_loop, daemon=True)
+                self._pipeline_thread.start()
+
+            self._pipeline_cond.notify()
+
+        return future
+
+    def _pipeline_loop(self):
+
+        with self._pipeline_cond:
+            while self._pipeline_running:
+                now = time.monotonic()
+                wait_time = None
+
+                for pipeline in self._pipelines.values():
+                    if not pipeline.pending or pipeline.in_flight >= self.pipeline_max_in_flight:
+                        continue
+
+                    due = pipeline.pending[0][3] + pipeline.flush_interval()
+
+                    if len(pipeline.pending) >= self.pipeline_batch_size or due <= now:
+                        batch = pipeline.pending[:self.pipeline_batch_size]
+                        del pipeline.pending[:self.pipeline_batch_size]
+                        pipeline.in_flight += 1
+                        self._fanout.submit(self._send_pipelined_batch, pipeline, batch)
+                    elif wait_time is None or due - now < wait_time:
+                        wait_time = due - now
+
+                self._pipeline_cond.wait(wait_time)
+
+    def _send_pipelined_batch(self, pipeline: _PeerPipeline, batch: List[tuple]):
+
+        node = pipeline.node
+        message = MessageProtocol.create_replication_batch_message(
+            sender_id=self.node_id,
+            entries=[{'transaction_id': txid, 'query': query} for txid, query, _, _ in batch]
+        )
+
+        rtt = None
+
+        try:
+            started = time.monotonic()
+            response = self.socket_client.send_message(
+                host=node['ip'],
+                port=node['port'],
+                message=message,
+                wait_for_response=True
+            )
+            rtt = time.monotonic() - started
+
+            data = MessageProtocol.get_message_data(response) if response else {}
+            acked = set(data.get('acked', []))
+
+            for transaction_id, _, future, _ in batch:
+                if transaction_id in acked:
+                    future.set_result({'type': message_types.REPLICATION_ACK})
+                else:
+                    future.set_result({'type': message_types.REPLICATION_NACK})
+
+        except Exception as e:
+            for _, _, future, _ in batch:
+                future.set_exception(e)
+
+        finally:
+            with self._pipeline_cond:
+                if rtt is not None:
+                    pipeline.rtt_samples.append(rtt)
+                pipeline.in_flight -= 1
+                self._pipeline_cond.notify()
+
+    def handle_replication_batch(
+        self,
+        entries: List[Dict[str, str]],
         sender_id: int,
         query_executor
     ) -> Dict[str, Any]:
 
+        self.logger.info(f"Received {len(entries)} replicated queries from node {sender_id}")
+        self._note_sender_activity(sender_id)
+
+        acked = []
+        failed = {}
+
+        for entry in entries:
+            transaction_id = entry.get('transaction_id')
+
+            try:
+                result = query_executor.execute(entry.get('query'), transaction_id, log_query=True)
+            except Exception as e:
+                failed[transaction_id] = str(e)
+                continue
+
+            if result.success:
+                acked.append(transaction_id)
+            else:
+                failed[transaction_id] = result.error or 'Unknown error'
+
+        if failed:
+            self.logger.error(f"Replication failed for {len(failed)} of {len(entries)} batched queries")
+
+        return MessageProtocol.create_message(
+            message_types.REPLICATION_ACK,
+            self.node_id,
+            {
+                'acked': acked,
+                'failed': failed
+            }
+        )
+
+    def handle_replication_request(
+        self,
+        query: str,
+        transaction_id: str,
+        sender_id: int,
+        query_executor,
+        ack_batched: bool = False
+    ) -> Optional[Dict[str, Any]]:
+
         self.logger.info(f"Received replication request from node {sender_id} for transaction {transaction_id}")
+        self._note_sender_activity(sender_id)
 
         try:
             result = query_executor.execute(query, transaction_id, log_query=True)
 
-            if result['success']:
+            if ack_batched:
+                if result.success:
+                    self._buffer_ack(sender_id, transaction_id)
+                    self.logger.info(f"Replication successful for transaction {transaction_id}")
+                else:
+                    self.logger.error(f"Replication failed for transaction {transaction_id}: {result.error}")
+                return None
+
+            if result.success:
                 response = MessageProtocol.create_message(
                     message_types.REPLICATION_ACK,
                     self.node_id,
@@ -110,15 +504,17 @@ class ReplicationManager:
                     {
                         'transaction_id': transaction_id,
                         'status': 'failed',
-                        'error': result.get('error', 'Unknown error')
+                        'error': result.error or 'Unknown error'
                     }
                 )
-                self.logger.error(f"Replication failed for transaction {transaction_id}: {result.get('error')}")
+                self.logger.error(f"Replication failed for transaction {transaction_id}: {result.error}")
 
             return response
 
         except Exception as e:
             self.logger.error(f"Error handling replication request: {e}")
+            if ack_batched:
+                return None
             return MessageProtocol.create_message(
                 message_types.REPLICATION_NACK,
                 self.node_id,
@@ -129,6 +525,93 @@ class ReplicationManager:
                 }
             )
 
+    def _buffer_ack(self, sender_id: int, transaction_id: str):
+
+        with self._ack_lock:
+            self._ack_buffer[sender_id].append(transaction_id)
+
+            if self._ack_thread is None:
+                self._ack_thread = threading.Thread(target=self._ack_flush_loop, daemon=True)
+                self._ack_thread.start()
+
+    def _ack_flush_loop(self):
+
+        while not self._ack_stop.wait(self.ack_flush_interval):
+            self._flush_acks()
+
+        self._flush_acks()
+
+    def _flush_acks(self):
+
+        with self._ack_lock:
+            if not self._ack_buffer:
+                return
+            buffered = self._ack_buffer
+            self._ack_buffer = defaultdict(list)
+
+        for sender_id, transaction_ids in buffered.items():
+            node = self._node_addresses.get(sender_id)
+
+            if node is None:
+                self.logger.warning(f"Cannot ack {len(transaction_ids)} replications: unknown node {sender_id}")
+                continue
+
+            message = MessageProtocol.create_message(
+                message_types.REPLICATION_ACK_BATCH,
+                self.node_id,
+                {'transaction_ids': transaction_ids}
+            )
+
+            try:
+                self.socket_client.send_oneway(
+                    host=node['ip'],
+                    port=node['port'],
+                    frame=MessageProtocol.frame(message)
+                )
+            except Exception as e:
+                self.logger.error(f"Failed to send ack batch to node {sender_id}: {e}")
+
+    def handle_ack_batch(self, sender_id: int, transaction_ids: List[str]):
+
+        self.logger.debug(f"Node {sender_id} acknowledged {len(transaction_ids)} replications")
+        self._note_sender_activity(sender_id)
+        self._record_acked_nodes(sender_id, transaction_ids)
+
+    def _record_acked_nodes(self, sender_id: int, transaction_ids: List[str]):
+
+        with self._log_lock:
+            base = self._repl_seq - len(self._repl_tx_ids)
+
+            for transaction_id in transaction_ids:
+                seq = self._repl_index.get(transaction_id)
+                if seq is None:
+                    continue
+
+                self._settle_pending(seq - base, sender_id)
+                successful_nodes = self._repl_success_lists[seq - base]
+                if sender_id not in successful_nodes:
+                    successful_nodes.append(sender_id)
+
+    def close(self):
+
+        if self._async_thread is not None:
+            self._async_queue.put(None)
+            self._async_thread.join(timeout=5)
+
+        self._ack_stop.set()
+
+        if self._ack_thread is not None:
+            self._ack_thread.join(timeout=1)
+
+        with self._pipeline_cond:
+            self._pipeline_running = False
+            self._pipeline_cond.notify()
+
+        if self._pipeline_thread is not None:
+            self._pipeline_thread.join(timeout=1)
+
+        self._fanout.shutdown(wait=False)
+
     def check_replication_consistency(
         self,
         transaction_id: str
@@ -144,12 +627,14 @@ class ReplicationManager:
 
         successful = replication_entry['successful_nodes']
         failed = replication_entry['failed_nodes']
+        pending = replication_entry['pending_nodes']
 
         return {
-            'consistent': len(failed) == 0,
+            'consistent': not failed and not pending,
             'transaction_id': transaction_id,
             'successful_nodes': successful,
             'failed_nodes': failed,
+            'pending_nodes': pending,
             'needs_repair': len(failed) > 0
         }
 
@@ -166,7 +651,8 @@ class ReplicationManager:
             query=query,
             transaction_id=transaction_id,
             target_nodes=failed_node_configs,
-            wait_for_ack=True
+            wait_for_ack=True,
+            required_acks=len(failed_node_configs)
         )
 
     def _log_replication(
@@ -174,28 +660,88 @@ class ReplicationManager:
         transaction_id: str,
         query: str,
         successful_nodes: List[int],
-        failed_nodes: List[int]
-    ):
+        failed_nodes: List[int],
+        pending_nodes: Optional[List[int]] = None
+    ) -> int:
+
+        timestamp = self._get_timestamp()
+
+        with self._log_lock:
+            query_id = self._stmt_ids.get(query)
+            if query_id is None:
+                query_id = next(self._stmt_counter)
+                self._stmt_ids[query] = query_id
+                self._stmt_texts[query_id] = query
+                self._stmt_refs[query_id] = 0
+            self._stmt_refs[query_id] += 1
+
+            if len(self._repl_tx_ids) == self.replication_log_size:
+                self._release_statement(self._repl_query_ids[0])
+
+                evicted_seq = self._repl_seq - self.replication_log_size
+                evicted = self._repl_tx_ids[0]
+                if self._repl_index.get(evicted) == evicted_seq:
+                    del self._repl_index[evicted]
+
+                if self._repl_failed_counts[0]:
+                    self._fail_count -= 1
+                else:
+                    self._success_count -= 1
+
+            self._repl_tx_ids.append(transaction_id)
+            self._repl_query_ids.append(query_id)
+            self._repl_success_lists.append(successful_nodes)
+            self._repl_fail_lists.append(failed_nodes)
+            self._repl_pending_lists.append(pending_nodes or [])
+            self._repl_failed_counts.append(len(failed_nodes))
+            self._repl_timestamps.append(timestamp)
+            seq = self._repl_seq
+            self._repl_index[transaction_id] = seq
+            self._repl_seq += 1
+
+            if failed_nodes:
+                self._fail_count += 1
+            else:
+                self._success_count += 1
 
-        log_entry = {
-            'transaction_id': transaction_id,
-            'query': query[:100], 
-            'successful_nodes': successful_nodes,
-            'failed_nodes': failed_nodes,
-            'timestamp': self._get_timestamp()
+        return seq
+
+    def _release_statement(self, query_id: int):
+
+        remaining = self._stmt_refs[query_id] - 1
+        if remaining:
+            self._stmt_refs[query_id] = remaining
+            return
+
+        del self._stmt_refs[query_id]
+        del self._stmt_ids[self._stmt_texts.pop(query_id)]
+
+    def _entry_at(self, position: int) -> Dict[str, Any]:
+
+        return {
+            'transaction_id': self._repl_tx_ids[position],
+            'query_id': self._repl_query_ids[position],
+            'query': self._stmt_texts.get(self._repl_query_ids[position]),
+            'successful_nodes': self._repl_success_lists[position],
+            'failed_nodes': self._repl_fail_lists[position],
+            'pending_nodes': self._repl_pending_lists[position],
+            'timestamp': self._repl_timestamps[position]
         }
 
-        self.replication_log.append(log_entry)
+    @property
+    def replication_log(self) -> List[Dict[str, Any]]:
 
-        if len(self.replication_log) > 1000:
-            self.replication_log = self.replication_log[-1000:]
+        with self._log_lock:
+            return [self._entry_at(i) for i in range(len(self._repl_tx_ids))]
 
     def _get_replication_entry(self, transaction_id: str) -> Optional[Dict[str, Any]]:
 
-        for entry in reversed(self.replication_log):
-            if entry['transaction_id'] == transaction_id:
-                return entry
-        return None
+        with self._log_lock:
+            seq = self._repl_index.get(transaction_id)
+            if seq is None:
+                return None
+
+            return self._entry_at(seq - (self._repl_seq - len(self._repl_tx_ids)))
 
     def _get_timestamp(self) -> str:
 
@@ -204,7 +750,13 @@ class ReplicationManager:
 
     def get_replication_stats(self) -> Dict[str, Any]:
 
-        if not self.replication_log:
+        with self._log_lock:
+            successful = self._success_count
+            failed = self._fail_count
+
+        total = successful + failed
+
+        if not total:
             return {
                 'total_replications': 0,
                 'successful': 0,
@@ -212,10 +764,6 @@ class ReplicationManager:
                 'success_rate': 0.0
             }
 
-        total = len(self.replication_log)
-        successful = sum(1 for entry in self.replication_log if not entry['failed_nodes'])
-        failed = total - successful
-
         return {
             'total_replications': total,
             'successful': successful,
@@ -1,5 +1,6 @@
 import logging
-from typing import Dict, Any, Callable, Optional, List
+import time
+from typing import Dict, Any, Callable, Optional, List, Tuple
 
 
 class HealthChecker:
@@ -17,10 +18,14 @@ class HealthChecker:
         self.logger = logging.getLogger(__name__)
 
         self.coordinator_id: Optional[int] = None
+        self._coordinator_alive = False
 
         self.failure_count: Dict[int, int] = {}  
         self.recovery_count: Dict[int, int] = {} 
 
+        self.cluster_cache_ttl = 0.1  # seconds
+        self._cluster_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+
     def check_node_health(self, node_id: int) -> Dict[str, Any]:
 
         is_alive = self.heartbeat_monitor.is_node_alive(node_id)
@@ -35,6 +40,23 @@ class HealthChecker:
 
     def check_cluster_health(self) -> Dict[str, Any]:
 
+        cached = self._cluster_cache
+        now = time.monotonic()
+
+        if cached is not None and now - cached[0] < self.cluster_cache_ttl:
+            return cached[1]
+
+        cluster_health = self._compute_cluster_health()
+        self._cluster_cache = (now, cluster_health)
+
+        return cluster_health
+
+    def invalidate_cluster_health(self):
+
+        self._cluster_cache = None
+
+    def _compute_cluster_health(self) -> Dict[str, Any]:
+
         alive_nodes = self.heartbeat_monitor.get_alive_nodes()
         dead_nodes = self.heartbeat_monitor.get_dead_nodes()
 
@@ -56,22 +78,32 @@ class HealthChecker:
         self.logger.warning(f"Handling failure of node {failed_node_id}")
 
         self.failure_count[failed_node_id] = self.failure_count.get(failed_node_id, 0) + 1
+        self.invalidate_cluster_health()
 
         if failed_node_id == self.coordinator_id:
             self.logger.critical(f"Coordinator (node {failed_node_id}) has failed!")
             self._handle_coordinator_failure()
 
+    def handle_node_status(self, node_id: int, alive: bool):
+
+        if node_id == self.coordinator_id:
+            self._coordinator_alive = alive
+            self.invalidate_cluster_health()
+
     def handle_node_recovery(self, recovered_node_id: int):
 
         self.logger.info(f"Node {recovered_node_id} has recovered")
 
         self.recovery_count[recovered_node_id] = self.recovery_count.get(recovered_node_id, 0) + 1
+        self.invalidate_cluster_health()
 
     def _handle_coordinator_failure(self):
 
         self.logger.info("Triggering coordinator election due to failure")
 
         self.coordinator_id = None
+        self._coordinator_alive = False
+        self.invalidate_cluster_health()
 
         if self.election_callback:
             try:
@@ -83,6 +115,12 @@ class HealthChecker:
 
         old_coordinator = self.coordinator_id
         self.coordinator_id = coordinator_id
+        self._coordinator_alive = (
+            coordinator_id is not None
+            and self.heartbeat_monitor is not None
+            and self.heartbeat_monitor.is_node_alive(coordinator_id)
+        )
+        self.invalidate_cluster_health()
 
         if old_coordinator != coordinator_id:
             self.logger.info(f"Coordinator changed from {old_coordinator} to {coordinator_id}")
@@ -93,14 +131,16 @@ class HealthChecker:
 
     def is_coordinator_alive(self) -> bool:
 
-        if self.coordinator_id is None:
-            return False
+        return self._coordinator_alive
 
-        return self.heartbeat_monitor.is_node_alive(self.coordinator_id)
-
-    def is_quorum_available(self, required_percentage: float = 0.5) -> bool:
+    def is_quorum_available(
+        self,
+        required_percentage: float = 0.5,
+        cluster_health: Optional[Dict[str, Any]] = None
+    ) -> bool:
 
-        cluster_health = self.check_cluster_health()
+        if cluster_health is None:
+            cluster_health = self.check_cluster_health()
         health_percentage = cluster_health['health_percentage'] / 100
 
         return health_percentage >= required_percentage
@@ -112,8 +152,8 @@ class HealthChecker:
         return {
             'cluster': cluster_health,
             'coordinator_id': self.coordinator_id,
-            'coordinator_alive': self.is_coordinator_alive(),
-            'quorum_available': self.is_quorum_available(),
+            'coordinator_alive': cluster_health['coordinator_alive'],
+            'quorum_available': self.is_quorum_available(cluster_health=cluster_health),
             'failure_stats': {
                 'total_failures': sum(self.failure_count.values()),
                 'total_recoveries': sum(self.recovery_count.values()),
@@ -122,7 +162,7 @@ class HealthChecker:
                         'failures': self.failure_count.get(node_id, 0),
                         'recoveries': self.recovery_count.get(node_id, 0)
                     }
-                    for node_id in set(list(self.failure_count.keys()) + list(self.recovery_count.keys()))
+                    for node_id in self.failure_count.keys() | self.recovery_count.keys()
                 }
             }
         }
@@ -1,12 +1,25 @@
+import heapq
 import logging
 import threading
 import time
-from typing import Dict, Callable, Optional
+from typing import Dict, Callable, List, Optional, Tuple
 from src.communication.socket_client import SocketClient
 from src.communication.protocol import MessageProtocol
 from src.communication import message_types
 
 
+def _mask_members(mask: int) -> List[int]:
+
+    members = []
+
+    while mask:
+        low_bit = mask & -mask
+        members.append(low_bit.bit_length() - 1)
+        mask ^= low_bit
+
+    return members
+
+
 class HeartbeatMonitor:
 
     def __init__(
@@ -15,22 +28,40 @@ class HeartbeatMonitor:
         socket_client: SocketClient,
         heartbeat_interval: int = 5,
         heartbeat_timeout: int = 15,
-        failure_callback: Optional[Callable] = None
+        failure_callback: Optional[Callable] = None,
+        status_callback: Optional[Callable] = None
     ):
         self.node_id = node_id
         self.socket_client = socket_client
         self.heartbeat_interval = heartbeat_interval
         self.heartbeat_timeout = heartbeat_timeout
         self.failure_callback = failure_callback
+        self.status_callback = status_callback
         self.logger = logging.getLogger(__name__)
 
-        self.last_heartbeat: Dict[int, float] = {}
+        self._interval_ns = int(heartbeat_interval * 1_000_000_000)
+        self._timeout_ns = int(heartbeat_timeout * 1_000_000_000)
+
+        self.last_heartbeat_ns: Dict[int, int] = {}
+
+        self._alive_mask = 0
+        self._dead_mask = 0
+        self._status_lock = threading.Lock()
+        self._peers: tuple = ()
+        self._alive_peers: tuple = ()
 
-        self.node_status: Dict[int, bool] = {}  
+        self._last_sent_ns: Dict[int, int] = {}
+        self._next_due_ns: Dict[int, int] = {}
+
+        # At most one (deadline, node) entry per node; _scheduled_mask marks nodes that have one
+        self._deadlines: List[Tuple[int, int]] = []
+        self._scheduled_mask = 0
+        self._deadline_cond = threading.Condition()
 
         self.running = False
-        self.sender_thread = None
-        self.checker_thread = None
+        self._stop_event = threading.Event()
+        self._heartbeat_bytes = b''
+        self.monitor_thread = None
 
     def start(self, all_nodes: list):
 
@@ -39,25 +70,23 @@ class HeartbeatMonitor:
             return
 
         self.running = True
+        self._stop_event.clear()
 
-        for node in all_nodes:
-            node_id = node['id']
-            if node_id != self.node_id:
-                self.node_status[node_id] = True
-                self.last_heartbeat[node_id] = time.time()
-
-        self.sender_thread = threading.Thread(
-            target=self._send_heartbeats,
-            args=(all_nodes,),
-            daemon=True
+        self._heartbeat_bytes = MessageProtocol.frame(
+            MessageProtocol.create_heartbeat_message(self.node_id)
         )
-        self.sender_thread.start()
 
-        self.checker_thread = threading.Thread(
-            target=self._check_heartbeats,
+        self._peers = tuple(node for node in all_nodes if node['id'] != self.node_id)
+
+        for node in self._peers:
+            self._set_alive(node['id'])
+            self._schedule_deadline(node['id'])
+
+        self.monitor_thread = threading.Thread(
+            target=self._run,
             daemon=True
         )
-        self.checker_thread.start()
+        self.monitor_thread.start()
 
         self.logger.info("Heartbeat monitor started")
 
@@ -68,81 +97,155 @@ class HeartbeatMonitor:
 
         self.logger.info("Stopping heartbeat monitor...")
         self.running = False
+        self._stop_event.set()
 
-        if self.sender_thread and self.sender_thread.is_alive():
-            self.sender_thread.join(timeout=5)
+        with self._deadline_cond:
+            self._deadline_cond.notify_all()
 
-        if self.checker_thread and self.checker_thread.is_alive():
-            self.checker_thread.join(timeout=5)
+        if self.monitor_thread and self.monitor_thread.is_alive():
+            self.monitor_thread.join(timeout=5)
 
         self.logger.info("Heartbeat monitor stopped")
 
-    def _send_heartbeats(self, all_nodes: list):
+    def _run(self):
 
-        while self.running:
+        # One thread both sends heartbeats and expires deadlines, sleeping until whichever is due first
+        while not self._stop_event.is_set():
             try:
+                next_send_ns = self._send_due_heartbeats()
 
-                heartbeat_msg = MessageProtocol.create_heartbeat_message(self.node_id)
+                for node_id, deadline_ns, now_ns in self._pop_expired():
+                    time_since_heartbeat = (now_ns - self.last_heartbeat_ns.get(node_id, deadline_ns)) / 1_000_000_000
+                    self.logger.warning(
+                        f"Node {node_id} failed (no heartbeat for {time_since_heartbeat:.1f}s)"
+                    )
+                    self._mark_node_dead(node_id)
 
-                for node in all_nodes:
-                    node_id = node['id']
+                with self._deadline_cond:
+                    if self._stop_event.is_set():
+                        break
 
-                    if node_id == self.node_id:
-                        continue
+                    wake_ns = next_send_ns
+                    if self._deadlines:
+                        wake_ns = min(wake_ns, self._deadlines[0][0])
 
-                    if not self.node_status.get(node_id, True):
-                        continue
-
-                    try:
-                        self.socket_client.send_message(
-                            host=node['ip'],
-                            port=node['port'],
-                            message=heartbeat_msg,
-                            wait_for_response=False
-                        )
-                    except Exception as e:
-                        self.logger.debug(f"Failed to send heartbeat to node {node_id}: {e}")
+                    timeout_ns = wake_ns - time.monotonic_ns()
+                    if timeout_ns > 0:
+                        self._deadline_cond.wait(timeout_ns / 1_000_000_000)
 
             except Exception as e:
-                self.logger.error(f"Error in heartbeat sender: {e}")
+                self.logger.error(f"Error in heartbeat monitor: {e}")
+                self._stop_event.wait(self.heartbeat_interval)
 
-            time.sleep(self.heartbeat_interval)
+    def _send_due_heartbeats(self) -> int:
 
-    def _check_heartbeats(self):
+        now_ns = time.monotonic_ns()
+        next_wake_ns = now_ns + self._interval_ns
+        targets = []
 
-        while self.running:
-            try:
-                current_time = time.time()
+        for node in self._alive_peers:
+            node_id = node['id']
+            due_ns = self._next_due_ns.get(node_id, 0)
 
-                for node_id, last_time in list(self.last_heartbeat.items()):
+            if due_ns > now_ns:
+                next_wake_ns = min(next_wake_ns, due_ns)
+                continue
 
-                    time_since_heartbeat = current_time - last_time
+            due_ns = now_ns + self._interval_ns
+            self._next_due_ns[node_id] = due_ns
+            next_wake_ns = min(next_wake_ns, due_ns)
 
-                    if time_since_heartbeat > self.heartbeat_timeout:
+            if now_ns - self._last_sent_ns.get(node_id, 0) < self._interval_ns // 2:
+                continue
 
-                        if self.node_status.get(node_id, True):
-                            self.logger.warning(
-                                f"Node {node_id} failed (no heartbeat for {time_since_heartbeat:.1f}s)"
-                            )
-                            self._mark_node_dead(node_id)
+            targets.append((node['ip'], node['port']))
 
-            except Exception as e:
-                self.logger.error(f"Error in heartbeat checker: {e}")
+        if targets:
+            self.socket_client.send_batch(targets, self._heartbeat_bytes)
+
+        return next_wake_ns
+
+    def _pop_expired(self) -> List[Tuple[int, int, int]]:
+
+        expired = []
+
+        with self._deadline_cond:
+            now_ns = time.monotonic_ns()
+
+            while self._deadlines and self._deadlines[0][0] <= now_ns:
+                deadline_ns, node_id = self._deadlines[0]
+                renewed_ns = self.last_heartbeat_ns.get(node_id, 0) + self._timeout_ns
+
+                # Heartbeats since this entry was pushed only moved the timestamp; push it forward
+                if renewed_ns > now_ns:
+                    heapq.heapreplace(self._deadlines, (renewed_ns, node_id))
+                    continue
+
+                heapq.heappop(self._deadlines)
+                self._scheduled_mask &= ~(1 << node_id)
+                expired.append((node_id, deadline_ns, now_ns))
+
+        return expired
 
-            time.sleep(1)
+    def _schedule_deadline(self, node_id: int):
+
+        now_ns = time.monotonic_ns()
+
+        with self._deadline_cond:
+            self.last_heartbeat_ns[node_id] = now_ns
+
+            bit = 1 << node_id
+            if self._scheduled_mask & bit:
+                return
+
+            self._scheduled_mask |= bit
+            entry = (now_ns + self._timeout_ns, node_id)
+            heapq.heappush(self._deadlines, entry)
+
+            if self._deadlines[0] is entry:
+                self._deadline_cond.notify()
 
     def record_heartbeat(self, node_id: int):
 
-        current_time = time.time()
-        self.last_heartbeat[node_id] = current_time
+        self._schedule_deadline(node_id)
 
-        if not self.node_status.get(node_id, True):
+        if self._set_alive(node_id):
             self.logger.info(f"Node {node_id} recovered")
-            self.node_status[node_id] = True
+
+    def note_activity(self, node_id: int):
+
+        if self._dead_mask & (1 << node_id) or time.monotonic_ns() - self.last_heartbeat_ns.get(node_id, 0) >= self._interval_ns // 2:
+            self.record_heartbeat(node_id)
+
+    def note_sent(self, node_id: int):
+
+        self._last_sent_ns[node_id] = time.monotonic_ns()
+
+    def _set_alive(self, node_id: int) -> bool:
+
+        bit = 1 << node_id
+
+        with self._status_lock:
+            was_alive = bool(self._alive_mask & bit)
+            was_dead = bool(self._dead_mask & bit)
+            self._alive_mask |= bit
+            self._dead_mask &= ~bit
+
+            if not was_alive:
+                self._publish_alive_peers()
+                self._notify_status(node_id, True)
+
+        return was_dead
 
     def _mark_node_dead(self, node_id: int):
 
-        self.node_status[node_id] = False
+        bit = 1 << node_id
+
+        with self._status_lock:
+            self._alive_mask &= ~bit
+            self._dead_mask |= bit
+            self._publish_alive_peers()
+            self._notify_status(node_id, False)
 
         if self.failure_callback:
             try:
@@ -150,38 +253,53 @@ class HeartbeatMonitor:
             except Exception as e:
                 self.logger.error(f"Error in failure callback: {e}")
 
+    def _publish_alive_peers(self):
+
+        # Rebuilt only on liveness transitions; the sender reads the tuple without locking
+        alive_mask = self._alive_mask
+        self._alive_peers = tuple(node for node in self._peers if alive_mask & (1 << node['id']))
+
+    def _notify_status(self, node_id: int, alive: bool):
+
+        # Runs under _status_lock so listeners see transitions in order
+        if self.status_callback:
+            try:
+                self.status_callback(node_id, alive)
+            except Exception as e:
+                self.logger.error(f"Error in status callback: {e}")
+
     def get_alive_nodes(self) -> list:
 
-        return [
-            node_id for node_id, is_alive in self.node_status.items()
-            if is_alive
-        ]
+        return _mask_members(self._alive_mask)
 
     def get_dead_nodes(self) -> list:
 
-        return [
-            node_id for node_id, is_alive in self.node_status.items()
-            if not is_alive
-        ]
+        return _mask_members(self._dead_mask)
 
     def is_node_alive(self, node_id: int) -> bool:
 
-        return self.node_status.get(node_id, False)
+        return bool(self._alive_mask & (1 << node_id))
 
     def get_status(self) -> Dict:
 
-        current_time = time.time()
+        now_ns = time.monotonic_ns()
+        # Heartbeats are stamped with the monotonic clock only; map back to wall time once per call
+        wall_offset = time.time() - now_ns / 1_000_000_000
+        alive_mask = self._alive_mask
+        nodes = {}
+
+        for node_id in _mask_members(alive_mask | self._dead_mask):
+            last_ns = self.last_heartbeat_ns.get(node_id)
+
+            nodes[node_id] = {
+                'alive': bool(alive_mask & (1 << node_id)),
+                'last_heartbeat': last_ns / 1_000_000_000 + wall_offset if last_ns is not None else 0,
+                'time_since_heartbeat': (now_ns - last_ns) / 1_000_000_000 if last_ns is not None else 0.0
+            }
 
         return {
             'running': self.running,
             'heartbeat_interval': self.heartbeat_interval,
             'heartbeat_timeout': self.heartbeat_timeout,
-            'nodes': {
-                node_id: {
-                    'alive': is_alive,
-                    'last_heartbeat': self.last_heartbeat.get(node_id, 0),
-                    'time_since_heartbeat': current_time - self.last_heartbeat.get(node_id, current_time)
-                }
-                for node_id, is_alive in self.node_status.items()
-            }
+            'nodes': nodes
         }
@@ -1,6 +1,9 @@
+import heapq
+import itertools
 import logging
 import threading
 import time
+from array import array
 from typing import Dict, List, Optional, Any
 from collections import defaultdict
 
@@ -14,13 +17,23 @@ class LoadBalancer:
         self.logger = logging.getLogger(__name__)
 
         self.current_index = 0
+        self._rr_counter = itertools.count()
+        self._rr_cache: tuple = (frozenset(), ())
 
-        self.query_counts: Dict[int, int] = defaultdict(int)
-        self.response_times: Dict[int, List[float]] = defaultdict(list)
-        self.active_queries: Dict[int, int] = defaultdict(int)
+        # Per-node counters live in parallel arrays; _pos maps a node id to its slot
+        self._pos: Dict[int, int] = {}
+        self._counts = array('q')
+        self._active = array('q')
 
-        # Thread safety
+        # Fixed ring of the last response_window samples per node; _rt_writes counts every sample
+        self.response_window = 100
+        self.response_times: Dict[int, array] = {}
+        self._rt_writes = array('q')
+        self._rt_sums = array('d')
+
+        # Thread safety: writers hold the lock; readers use the last published snapshot
         self.lock = threading.Lock()
+        self._published: Optional[Dict[int, Dict[str, Any]]] = None
 
     def select_node(
         self,
@@ -49,104 +62,179 @@ class LoadBalancer:
 
     def _select_round_robin(self, available_nodes: List[int]) -> int:
 
-        with self.lock:
+        sorted_nodes = self._sorted_nodes(available_nodes)
+
+        index = next(self._rr_counter)
+        self.current_index = index + 1
+
+        node = sorted_nodes[index % len(sorted_nodes)]
+
+        self.logger.debug(f"Round-robin selected node {node}")
+        return node
 
-            sorted_nodes = sorted(available_nodes)
+    def _sorted_nodes(self, available_nodes: List[int]) -> tuple:
 
-            node = sorted_nodes[self.current_index % len(sorted_nodes)]
+        key = frozenset(available_nodes)
+        cache = self._rr_cache
 
-            self.current_index += 1
+        if key != cache[0]:
+            cache = self._rr_cache = (key, tuple(sorted(key)))
 
-            self.logger.debug(f"Round-robin selected node {node}")
-            return node
+        return cache[1]
 
     def _select_least_loaded(self, available_nodes: List[int]) -> int:
 
-        with self.lock:
+        # Unlocked reads: a load estimate one update stale is fine for routing
+        selected_node = None
+        best_score = float('inf')
+
+        for node_id in available_nodes:
+
+            load_score = self._active_count(node_id) * 10 + self._get_average_response_time(node_id)
 
-            node_loads = {}
+            if load_score < best_score:
+                selected_node = node_id
+                best_score = load_score
 
-            for node_id in available_nodes:
+        self.logger.debug(
+            f"Least-loaded selected node {selected_node} "
+            f"(load: {best_score:.2f})"
+        )
+        return selected_node
 
-                active = self.active_queries.get(node_id, 0)
-                avg_response = self._get_average_response_time(node_id)
+    def _slot(self, node_id: int) -> int:
 
-                load_score = active * 10 + avg_response
+        pos = self._pos.get(node_id)
 
-                node_loads[node_id] = load_score
+        if pos is None:
+            for counters in (self._counts, self._active, self._rt_writes, self._rt_sums):
+                counters.append(0)
+            pos = self._pos[node_id] = len(self._counts) - 1
 
-            selected_node = min(node_loads, key=node_loads.get)
+        return pos
 
-            self.logger.debug(
-                f"Least-loaded selected node {selected_node} "
-                f"(load: {node_loads[selected_node]:.2f})"
-            )
-            return selected_node
+    def _active_count(self, node_id: int) -> int:
+
+        pos = self._pos.get(node_id)
+        return self._active[pos] if pos is not None else 0
 
     def record_query_start(self, node_id: int):
 
         with self.lock:
-            self.active_queries[node_id] += 1
-            self.query_counts[node_id] += 1
+            pos = self._slot(node_id)
+            self._active[pos] += 1
+            self._counts[pos] += 1
+            self._published = None
 
     def record_query_end(self, node_id: int, response_time: float):
 
         with self.lock:
+            pos = self._slot(node_id)
+
+            if self._active[pos] > 0:
+                self._active[pos] -= 1
 
-            if self.active_queries[node_id] > 0:
-                self.active_queries[node_id] -= 1
+            ring = self.response_times.get(node_id)
+            if ring is None:
+                ring = self.response_times[node_id] = array('d', bytes(8 * self.response_window))
 
+            writes = self._rt_writes[pos]
+            slot = writes % self.response_window
 
-            self.response_times[node_id].append(response_time)
-            if len(self.response_times[node_id]) > 100:
-                self.response_times[node_id] = self.response_times[node_id][-100:]
+            if slot == self.response_window - 1:
+                # Resync once per lap so float error in the running sum cannot accumulate
+                ring[slot] = response_time
+                self._rt_sums[pos] = sum(ring)
+            else:
+                self._rt_sums[pos] += response_time - ring[slot]
+                ring[slot] = response_time
+
+            self._rt_writes[pos] = writes + 1
+            self._published = None
 
     def _get_average_response_time(self, node_id: int) -> float:
 
-        response_times = self.response_times.get(node_id, [])
+        pos = self._pos.get(node_id)
+        if pos is None:
+            return 0.0
+
+        count = min(self._rt_writes[pos], self.response_window)
 
-        if not response_times:
+        if not count:
             return 0.0
 
-        return sum(response_times) / len(response_times)
+        return self._rt_sums[pos] / count
+
+    def _recent_response_times(self, node_id: int, limit: int) -> List[float]:
+
+        pos = self._pos.get(node_id)
+        writes = self._rt_writes[pos] if pos is not None else 0
+        count = min(writes, self.response_window, limit)
+        ring = self.response_times.get(node_id)
+        if ring is None:
+            return []
+
+        return [ring[i % self.response_window] for i in range(writes - count, writes)]
+
+    def _node_load(self, node_id: int) -> Dict[str, Any]:
+
+        return {
+            'node_id': node_id,
+            'active_queries': self._active_count(node_id),
+            'total_queries': self._counts[self._pos[node_id]] if node_id in self._pos else 0,
+            'average_response_time': self._get_average_response_time(node_id),
+            'recent_response_times': self._recent_response_times(node_id, 10)
+        }
+
+    def _snapshot(self) -> Dict[int, Dict[str, Any]]:
+
+        snapshot = self._published
+
+        if snapshot is None:
+            with self.lock:
+                snapshot = {
+                    node_id: self._node_load(node_id)
+                    for node_id in self._pos
+                }
+                self._published = snapshot
+
+        return snapshot
 
     def get_node_load(self, node_id: int) -> Dict[str, Any]:
 
-        with self.lock:
-            return {
-                'node_id': node_id,
-                'active_queries': self.active_queries.get(node_id, 0),
-                'total_queries': self.query_counts.get(node_id, 0),
-                'average_response_time': self._get_average_response_time(node_id),
-                'recent_response_times': self.response_times.get(node_id, [])[-10:]
-            }
+        load = self._snapshot().get(node_id)
+        if load is None:
+            load = self._node_load(node_id)
+
+        return load
 
     def get_cluster_load(self, available_nodes: List[int]) -> Dict[str, Any]:
 
-        with self.lock:
-            total_active = sum(self.active_queries.get(n, 0) for n in available_nodes)
-            total_queries = sum(self.query_counts.get(n, 0) for n in available_nodes)
-
-            node_loads = {
-                node_id: self.get_node_load(node_id)
-                for node_id in available_nodes
-            }
-
-            return {
-                'total_active_queries': total_active,
-                'total_queries_processed': total_queries,
-                'node_count': len(available_nodes),
-                'nodes': node_loads,
-                'strategy': self.strategy
-            }
+        snapshot = self._snapshot()
+
+        node_loads = {
+            node_id: snapshot.get(node_id) or self._node_load(node_id)
+            for node_id in available_nodes
+        }
+
+        return {
+            'total_active_queries': sum(load['active_queries'] for load in node_loads.values()),
+            'total_queries_processed': sum(load['total_queries'] for load in node_loads.values()),
+            'node_count': len(available_nodes),
+            'nodes': node_loads,
+            'strategy': self.strategy
+        }
 
     def reset_statistics(self):
 
         with self.lock:
-            self.query_counts.clear()
+            # Zeroed in place: unlocked readers may still hold slot positions
+            for counters in (self._counts, self._active, self._rt_writes, self._rt_sums):
+                counters[:] = array(counters.typecode, bytes(counters.itemsize * len(counters)))
             self.response_times.clear()
-            self.active_queries.clear()
+            self._rr_counter = itertools.count()
             self.current_index = 0
+            self._published = None
             self.logger.info("Load balancer statistics reset")
 
     def set_strategy(self, strategy: str):
@@ -160,17 +248,15 @@ class LoadBalancer:
 
     def get_statistics(self) -> Dict[str, Any]:
 
-        with self.lock:
-            total_queries = sum(self.query_counts.values())
-            total_active = sum(self.active_queries.values())
+        counts = self._counts
 
-            return {
-                'strategy': self.strategy,
-                'total_queries_routed': total_queries,
-                'total_active_queries': total_active,
-                'nodes_tracked': len(self.query_counts),
-                'current_round_robin_index': self.current_index
-            }
+        return {
+            'strategy': self.strategy,
+            'total_queries_routed': sum(counts),
+            'total_active_queries': sum(self._active),
+            'nodes_tracked': len(counts) - counts.count(0),
+            'current_round_robin_index': self.current_index
+        }
 
     def distribute_queries(
         self,
@@ -178,14 +264,45 @@ class LoadBalancer:
         available_nodes: List[int]
     ) -> Dict[int, int]:
 
-        if not available_nodes:
+        if not available_nodes or query_count <= 0:
             return {}
 
+        if self.strategy == "least_loaded":
+            return self._distribute_least_loaded(query_count, available_nodes)
+
+        # Round-robin hands out whole laps, and the remainder continues from the current index
+        sorted_nodes = self._sorted_nodes(available_nodes)
+        node_count = len(sorted_nodes)
+
+        with self.lock:
+            start = next(self._rr_counter)
+            self._rr_counter = itertools.count(start + query_count)
+            self.current_index = start + query_count
+
+        laps, remainder = divmod(query_count, node_count)
+        distribution = {}
+
+        for offset in range(node_count):
+            count = laps + (1 if offset < remainder else 0)
+            if count:
+                distribution[sorted_nodes[(start + offset) % node_count]] = count
+
+        return distribution
+
+    def _distribute_least_loaded(self, query_count: int, available_nodes: List[int]) -> Dict[int, int]:
+
+        # Each assignment adds one active query's weight to the node it lands on
+        heap = [
+            (self._active_count(node_id) * 10 + self._get_average_response_time(node_id), position, node_id)
+            for position, node_id in enumerate(available_nodes)
+        ]
+        heapq.heapify(heap)
+
         distribution = defaultdict(int)
 
         for _ in range(query_count):
-            node = self.select_node(available_nodes)
-            if node:
-                distribution[node] += 1
+            score, position, node_id = heap[0]
+            distribution[node_id] += 1
+            heapq.heapreplace(heap, (score + 10, position, node_id))
 
         return dict(distribution)
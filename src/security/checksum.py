@@ -1,45 +1,62 @@
 import hashlib
-import json
-from datetime import datetime
+import hmac
+import orjson
 from typing import Dict, Any, Union
 
+# Keys are sorted on their string form, so int-keyed dicts hash the same after a wire round trip
+_CANONICAL_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
 
-class DateTimeEncoder(json.JSONEncoder):
 
-    def default(self, obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        return super().default(obj)
+def _digest(data: bytes) -> bytes:
 
+    return hashlib.sha256(data).digest()
 
-def calculate_checksum(data: Union[str, Dict[str, Any]]) -> str:
+
+def calculate_checksum_fast(data: bytes) -> str:
+
+    return hashlib.sha256(data).hexdigest()
+
+
+def _digest_matches(data: bytes, expected_checksum: str) -> bool:
+
+    try:
+        expected = bytes.fromhex(expected_checksum)
+    except (TypeError, ValueError):
+        return False
+
+    return hmac.compare_digest(_digest(data), expected)
+
+
+def _canonical_bytes(message: Dict[str, Any]) -> bytes:
+
+    return orjson.dumps(message, option=_CANONICAL_OPTIONS)
+
+
+def calculate_checksum(data: Union[bytes, str, Dict[str, Any]]) -> str:
 
     if isinstance(data, dict):
-        data = json.dumps(data, sort_keys=True, cls=DateTimeEncoder)
+        return calculate_checksum_fast(_canonical_bytes(data))
 
     if isinstance(data, str):
         data = data.encode('utf-8')
 
-    sha256_hash = hashlib.sha256(data)
-    return sha256_hash.hexdigest()
+    return calculate_checksum_fast(data)
 
 
 def verify_checksum(data: Union[str, Dict[str, Any]], expected_checksum: str) -> bool:
 
-    calculated_checksum = calculate_checksum(data)
-    return calculated_checksum == expected_checksum
-
-
-def add_checksum(message: Dict[str, Any]) -> Dict[str, Any]:
+    if isinstance(data, dict):
+        data = _canonical_bytes(data)
+    elif isinstance(data, str):
+        data = data.encode('utf-8')
 
-    message_copy = message.copy()
+    return _digest_matches(data, expected_checksum)
 
-    if 'checksum' in message_copy:
-        del message_copy['checksum']
 
-    checksum = calculate_checksum(message_copy)
+def add_checksum(message: Dict[str, Any]) -> Dict[str, Any]:
 
-    message['checksum'] = checksum
+    payload = _canonical_bytes({k: v for k, v in message.items() if k != 'checksum'})
+    message['checksum'] = calculate_checksum_fast(payload)
 
     return message
 
@@ -49,15 +66,14 @@ def verify_message_checksum(message: Dict[str, Any]) -> bool:
     if 'checksum' not in message:
         return False
 
-    expected_checksum = message['checksum']
-
-    message_copy = message.copy()
-    del message_copy['checksum']
-
-    return verify_checksum(message_copy, expected_checksum)
+    payload = _canonical_bytes({k: v for k, v in message.items() if k != 'checksum'})
+    return _digest_matches(payload, message['checksum'])
 
 
 def generate_data_signature(data: str, salt: str = "") -> str:
 
-    combined = f"{data}{salt}"
-    return calculate_checksum(combined)
+    sha256_hash = hashlib.sha256(data.encode('utf-8'))
+    if salt:
+        sha256_hash.update(salt.encode('utf-8'))
+
+    return sha256_hash.hexdigest()
@@ -1,7 +1,8 @@
 import logging
+import sys
 import threading
 import time
-from typing import Dict, Set, Optional
+from typing import Dict, Optional, Tuple
 from enum import Enum
 
 
@@ -11,25 +12,165 @@ class LockType(Enum):
     EXCLUSIVE = "EXCLUSIVE"
 
 
+_SHARED = LockType.SHARED
+
+
 class Lock:
 
+    __slots__ = ('lock_type', 'lock_type_str', 'transaction_id', 'acquired_at')
+
     def __init__(self, lock_type: LockType, transaction_id: str):
 
         self.lock_type = lock_type
+        self.lock_type_str = lock_type.value
         self.transaction_id = transaction_id
-        self.acquired_at = time.time()
+        self.acquired_at = time.monotonic()
+
+
+class _ResourceLocks:
+
+    __slots__ = ('shared', 'exclusive')
+
+    def __init__(self):
+
+        self.shared: Dict[str, Lock] = {}
+        self.exclusive: Optional[Lock] = None
+
+    def can_grant(self, transaction_id: str, lock_type: LockType) -> bool:
+
+        exclusive = self.exclusive
+
+        if exclusive is not None:
+            return exclusive.transaction_id == transaction_id
+
+        if lock_type is _SHARED:
+            return True
+
+        shared = self.shared
+        if not shared:
+            return True
+
+        # Sole shared holder upgrading in place
+        return len(shared) == 1 and transaction_id in shared
+
+    def grant(self, transaction_id: str, lock_type: LockType):
+
+        exclusive = self.exclusive
+        if exclusive is not None and exclusive.transaction_id == transaction_id:
+            return
+
+        if lock_type is _SHARED:
+            if transaction_id not in self.shared:
+                self.shared[transaction_id] = Lock(lock_type, transaction_id)
+            return
+
+        # Upgrading moves the holder out of the shared set
+        self.shared.pop(transaction_id, None)
+        self.exclusive = Lock(lock_type, transaction_id)
+
+    def release(self, transaction_id: str) -> bool:
+
+        if self.shared.pop(transaction_id, None) is not None:
+            return True
+
+        exclusive = self.exclusive
+        if exclusive is not None and exclusive.transaction_id == transaction_id:
+            self.exclusive = None
+            return True
+
+        return False
+
+    def blockers(self, transaction_id: str, lock_type: LockType) -> Tuple[str, ...]:
+
+        exclusive = self.exclusive
+
+        if exclusive is not None:
+            if exclusive.transaction_id == transaction_id:
+                return ()
+            return (exclusive.transaction_id,)
+
+        if lock_type is _SHARED:
+            return ()
+
+        # tuple() copies the keys in one step, so a concurrent grant cannot break the iteration
+        return tuple(txn for txn in tuple(self.shared) if txn != transaction_id)
+
+    def holder(self, transaction_id: str) -> Optional[Lock]:
+
+        exclusive = self.exclusive
+        if exclusive is not None and exclusive.transaction_id == transaction_id:
+            return exclusive
+
+        return self.shared.get(transaction_id)
+
+    def holders(self) -> list:
+
+        held = list(self.shared.values())
+        if self.exclusive is not None:
+            held.append(self.exclusive)
+
+        return held
+
+    def __bool__(self) -> bool:
+
+        return self.exclusive is not None or bool(self.shared)
+
+
+class _Stripe:
+
+    __slots__ = ('lock', 'cv', 'locks', 'idle')
+
+    def __init__(self):
+
+        self.lock = threading.Lock()
+        self.cv = threading.Condition(self.lock)
+        self.locks: Dict[str, _ResourceLocks] = {}
+        self.idle = 0
+
+    def compact(self):
+
+        self.locks = {resource: held for resource, held in self.locks.items() if held}
+        self.idle = 0
 
 
 class LockManager:
 
+    STRIPE_COUNT = 64
+    IDLE_ENTRY_LIMIT = 256
+
     def __init__(self):
 
         self.logger = logging.getLogger(__name__)
-        self.locks: Dict[str, list[Lock]] = {}  
-        self.transaction_locks: Dict[str, Set[str]] = {}  
-        self.lock = threading.RLock()  
+        # Resources hash onto independent stripes so unrelated tables never share a mutex
+        self._stripes = [_Stripe() for _ in range(self.STRIPE_COUNT)]
+        self._stripe_shift = 64 - (self.STRIPE_COUNT.bit_length() - 1)
+        # txn -> resource -> (stripe, entry) so releases go straight to the held entries
+        self.transaction_locks: Dict[str, Dict[str, Tuple[_Stripe, _ResourceLocks]]] = {}
+        self._txn_lock = threading.Lock()
+        # Blocked transaction -> (resource, requested mode), guarded by _txn_lock
+        self._waiting: Dict[str, Tuple[str, LockType]] = {}
         self.wait_timeout = 30 
 
+    def _stripe_for(self, resource: str) -> _Stripe:
+
+        # Multiply-shift keeps the well-mixed high bits instead of taking hash() modulo
+        index = ((hash(resource) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> self._stripe_shift
+        return self._stripes[index]
+
+    @property
+    def locks(self) -> Dict[str, list]:
+
+        merged = {}
+        for stripe in self._stripes:
+            with stripe.lock:
+                merged.update(
+                    (resource, resource_locks.holders())
+                    for resource, resource_locks in stripe.locks.items()
+                    if resource_locks
+                )
+
+        return merged
+
     def acquire_lock(
         self,
         resource: str,
@@ -38,162 +179,221 @@ class LockManager:
         timeout: float = None
     ) -> bool:
 
+        # Resource names are table names drawn from a small set, so interning keeps
+        # every later dict/set probe on the identity fast path
+        resource = sys.intern(resource)
         timeout = timeout or self.wait_timeout
-        start_time = time.time()
-
-        while True:
-            with self.lock:
-
-                if self._can_acquire(resource, transaction_id, lock_type):
-
-                    new_lock = Lock(lock_type, transaction_id)
-
-                    if resource not in self.locks:
-                        self.locks[resource] = []
-                    self.locks[resource].append(new_lock)
+        _now = time.monotonic
+        deadline = _now() + timeout
+        stripe = self._stripe_for(resource)
+
+        with stripe.cv:
+            waiting = False
+
+            try:
+                while not self._can_acquire(stripe, resource, transaction_id, lock_type):
+                    remaining = deadline - _now()
+
+                    if remaining <= 0:
+                        self.logger.warning(
+                            "Transaction %s timed out waiting for %s lock on %s",
+                            transaction_id, lock_type.value, resource
+                        )
+                        return False
+
+                    waiting = True
+                    if self._register_wait(transaction_id, resource, lock_type):
+                        self.logger.warning(
+                            "Deadlock detected: transaction %s gives up %s lock on %s",
+                            transaction_id, lock_type.value, resource
+                        )
+                        return False
+
+                    stripe.cv.wait(timeout=remaining)
+            finally:
+                if waiting:
+                    with self._txn_lock:
+                        self._waiting.pop(transaction_id, None)
+
+            resource_locks = stripe.locks.get(resource)
+            if resource_locks is None:
+                resource_locks = stripe.locks[resource] = _ResourceLocks()
+            elif not resource_locks:
+                stripe.idle -= 1
+            resource_locks.grant(transaction_id, lock_type)
+
+            with self._txn_lock:
+                held = self.transaction_locks.get(transaction_id)
+                if held is None:
+                    held = self.transaction_locks[transaction_id] = {}
+                held[resource] = (stripe, resource_locks)
+
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(
+                    "Transaction %s acquired %s lock on %s", transaction_id, lock_type.value, resource
+                )
+            return True
 
-                    if transaction_id not in self.transaction_locks:
-                        self.transaction_locks[transaction_id] = set()
-                    self.transaction_locks[transaction_id].add(resource)
+    def release_lock(self, resource: str, transaction_id: str) -> bool:
 
-                    self.logger.debug(
-                        f"Transaction {transaction_id} acquired {lock_type.value} lock on {resource}"
-                    )
-                    return True
+        stripe = self._stripe_for(resource)
 
-            if time.time() - start_time >= timeout:
-                self.logger.warning(
-                    f"Transaction {transaction_id} timed out waiting for {lock_type.value} lock on {resource}"
-                )
+        with stripe.cv:
+            resource_locks = stripe.locks.get(resource)
+            if resource_locks is None:
                 return False
 
-            time.sleep(0.1)
-
-    def release_lock(self, resource: str, transaction_id: str) -> bool:
+            released = self._release_entry(stripe, resource_locks, transaction_id)
 
-        with self.lock:
-            if resource not in self.locks:
-                return False
+            with self._txn_lock:
+                held = self.transaction_locks.get(transaction_id)
+                if held is not None:
+                    held.pop(resource, None)
+                    if not held:
+                        del self.transaction_locks[transaction_id]
 
-            initial_count = len(self.locks[resource])
-            self.locks[resource] = [
-                lock for lock in self.locks[resource]
-                if lock.transaction_id != transaction_id
-            ]
+            if released:
+                self.logger.debug("Transaction %s released lock on %s", transaction_id, resource)
+                stripe.cv.notify_all()
 
+            return released
 
-            if not self.locks[resource]:
-                del self.locks[resource]
+    def release_all_locks(self, transaction_id: str):
 
+        with self._txn_lock:
+            held = self.transaction_locks.pop(transaction_id, None)
 
-            if transaction_id in self.transaction_locks:
-                self.transaction_locks[transaction_id].discard(resource)
-                if not self.transaction_locks[transaction_id]:
-                    del self.transaction_locks[transaction_id]
+        if not held:
+            return
 
-            released = len(self.locks.get(resource, [])) < initial_count
+        by_stripe: Dict[_Stripe, list] = {}
+        for stripe, resource_locks in held.values():
+            by_stripe.setdefault(stripe, []).append(resource_locks)
 
-            if released:
-                self.logger.debug(f"Transaction {transaction_id} released lock on {resource}")
+        # One critical section and one wake-up per stripe instead of per resource
+        for stripe, entries in by_stripe.items():
+            with stripe.cv:
+                released = False
+                for resource_locks in entries:
+                    if self._release_entry(stripe, resource_locks, transaction_id):
+                        released = True
 
-            return released
+                if released:
+                    stripe.cv.notify_all()
 
-    def release_all_locks(self, transaction_id: str):
+        self.logger.debug("Released all locks for transaction %s", transaction_id)
 
-        with self.lock:
-            if transaction_id not in self.transaction_locks:
-                return
+    def _release_entry(self, stripe: _Stripe, resource_locks: _ResourceLocks, transaction_id: str) -> bool:
 
-            resources = list(self.transaction_locks[transaction_id])
+        # Entries held by a transaction are never empty, so compaction cannot orphan them
+        released = resource_locks.release(transaction_id)
 
-            for resource in resources:
-                self.release_lock(resource, transaction_id)
+        # Empty entries stay put so hot resources skip the dict delete/insert churn
+        if released and not resource_locks:
+            stripe.idle += 1
+            if stripe.idle > self.IDLE_ENTRY_LIMIT:
+                stripe.compact()
 
-            self.logger.debug(f"Released all locks for transaction {transaction_id}")
+        return released
 
     def _can_acquire(
         self,
+        stripe: _Stripe,
         resource: str,
         transaction_id: str,
         lock_type: LockType
     ) -> bool:
 
-        if resource not in self.locks or not self.locks[resource]:
+        resource_locks = stripe.locks.get(resource)
+
+        if resource_locks is None:
             return True
 
-        existing_locks = self.locks[resource]
+        return resource_locks.can_grant(transaction_id, lock_type)
+
+    def _register_wait(self, transaction_id: str, resource: str, lock_type: LockType) -> bool:
 
-        has_lock = any(lock.transaction_id == transaction_id for lock in existing_locks)
+        with self._txn_lock:
+            self._waiting[transaction_id] = (resource, lock_type)
+            return self._in_wait_cycle(transaction_id)
 
-        if lock_type == LockType.SHARED:
+    def _in_wait_cycle(self, transaction_id: str) -> bool:
 
-            if has_lock:
-                return True
-            return all(lock.lock_type == LockType.SHARED for lock in existing_locks)
+        # Iterative DFS over the wait-for graph: waiter -> holders blocking its request.
+        # Other stripes are read without their mutexes (stripe locks must never be taken
+        # under _txn_lock); a stale edge is corrected on the waiter's next wake-up.
+        waiting = self._waiting
+        visited = {transaction_id}
+        stack = [transaction_id]
 
-        elif lock_type == LockType.EXCLUSIVE:
+        while stack:
+            waiter = stack.pop()
+            request = waiting.get(waiter)
+            if request is None:
+                continue
 
-            if has_lock:
-                return all(lock.transaction_id == transaction_id for lock in existing_locks)
-            return False
+            resource, lock_type = request
+            resource_locks = self._stripe_for(resource).locks.get(resource)
+            if resource_locks is None:
+                continue
+
+            for holder in resource_locks.blockers(waiter, lock_type):
+                if holder == transaction_id:
+                    return True
+                if holder not in visited:
+                    visited.add(holder)
+                    stack.append(holder)
 
         return False
 
     def detect_deadlock(self, transaction_id: str) -> bool:
 
-        with self.lock:
-            if transaction_id not in self.transaction_locks:
-                return False
+        with self._txn_lock:
+            return self._in_wait_cycle(transaction_id)
 
-            for resource in self.transaction_locks.get(transaction_id, []):
-                if resource in self.locks:
-                    for lock in self.locks[resource]:
-                        if lock.transaction_id == transaction_id:
-                            wait_time = time.time() - lock.acquired_at
-                            if wait_time > self.wait_timeout:
-                                return True
+    def get_lock_info(self, resource: str = None) -> Dict:
 
-        return False
+        if resource:
+            stripe = self._stripe_for(resource)
 
-    def get_lock_info(self, resource: str = None) -> Dict:
+            with stripe.lock:
+                resource_locks = stripe.locks.get(resource)
+                locks = resource_locks.holders() if resource_locks is not None else []
+
+            return {
+                'resource': resource,
+                'locks': self._describe_locks(locks, time.monotonic())
+            }
+
+        all_locks = self.locks
+        now = time.monotonic()
 
-        with self.lock:
-            if resource:
-                locks = self.locks.get(resource, [])
-                return {
-                    'resource': resource,
-                    'locks': [
-                        {
-                            'type': lock.lock_type.value,
-                            'transaction_id': lock.transaction_id,
-                            'duration': time.time() - lock.acquired_at
-                        }
-                        for lock in locks
-                    ]
-                }
-            else:
-                return {
-                    'total_resources': len(self.locks),
-                    'resources': {
-                        res: [
-                            {
-                                'type': lock.lock_type.value,
-                                'transaction_id': lock.transaction_id,
-                                'duration': time.time() - lock.acquired_at
-                            }
-                            for lock in locks
-                        ]
-                        for res, locks in self.locks.items()
-                    }
-                }
+        resources = {}
+        for res, locks in all_locks.items():
+            resources[res] = self._describe_locks(locks, now)
+
+        return {
+            'total_resources': len(all_locks),
+            'resources': resources
+        }
+
+    def _describe_locks(self, locks: list, now: float) -> list:
+
+        described = []
+        append = described.append
+        for lock in locks:
+            append({
+                'type': lock.lock_type_str,
+                'transaction_id': lock.transaction_id,
+                'duration': now - lock.acquired_at
+            })
+
+        return described
 
     def has_lock(self, resource: str, transaction_id: str) -> bool:
 
-        with self.lock:
-            if resource not in self.locks:
-                return False
+        stripe = self._stripe_for(resource)
 
-            return any(
-                lock.transaction_id == transaction_id
-                for lock in self.locks[resource]
-            )
+        with stripe.lock:
+            resource_locks = stripe.locks.get(resource)
+            return resource_locks is not None and resource_locks.holder(transaction_id) is not None
@@ -1,5 +1,8 @@
 import logging
-from typing import Dict, Any, Optional
+import threading
+import time
+from array import array
+from typing import Dict, Any, List, Optional
 from enum import Enum
 from src.transaction.lock_manager import LockManager, LockType
 from src.utils.helpers import generate_transaction_id
@@ -16,15 +19,55 @@ class TransactionState(Enum):
     ABORTED = "ABORTED"
 
 
+# States are stored as small ints in the manager's per-slot arrays
+_STATES = tuple(TransactionState)
+_STATE_CODES = {state: code for code, state in enumerate(_STATES)}
+_FREE_SLOT = -1
+
+# Source states each transition may start from
+_CAN_PREPARE = frozenset(_STATE_CODES[s] for s in (TransactionState.ACTIVE,))
+_CAN_COMMIT = frozenset(_STATE_CODES[s] for s in (TransactionState.ACTIVE, TransactionState.PREPARED))
+_CAN_ABORT = frozenset(
+    _STATE_CODES[s] for s in (TransactionState.ACTIVE, TransactionState.PREPARING, TransactionState.PREPARED)
+)
+_IS_PREPARING = frozenset((_STATE_CODES[TransactionState.PREPARING],))
+_IS_COMMITTING = frozenset((_STATE_CODES[TransactionState.COMMITTING],))
+_IS_ABORTING = frozenset((_STATE_CODES[TransactionState.ABORTING],))
+# In-doubt (prepared) 2PC participants are never expired by age
+_CAN_EXPIRE = frozenset(_STATE_CODES[s] for s in (TransactionState.ACTIVE,))
+
+
 class Transaction:
 
-    def __init__(self, transaction_id: str):
+    __slots__ = ('transaction_id', 'queries', 'locks', 'connection', 'slot', '_states', '_started_at')
+
+    def __init__(self, transaction_id: str, slot: int, states: array, started_at: array):
 
-        self.transaction_id = transaction_id
-        self.state = TransactionState.ACTIVE
         self.queries = []
         self.locks = set()
+        self.slot = slot
+        self._states = states
+        self._started_at = started_at
+        self._reset(transaction_id)
+
+    @property
+    def state(self) -> TransactionState:
+
+        return _STATES[self._states[self.slot]]
+
+    @property
+    def started_at(self) -> float:
+
+        return self._started_at[self.slot]
+
+    def _reset(self, transaction_id: str):
+
+        self.transaction_id = transaction_id
+        self._states[self.slot] = _STATE_CODES[TransactionState.ACTIVE]
+        self.queries.clear()
+        self.locks.clear()
         self.connection = None
+        self._started_at[self.slot] = time.monotonic()
 
 
 class TransactionManager:
@@ -34,21 +77,53 @@ class TransactionManager:
         self.node_id = node_id
         self.lock_manager = lock_manager or LockManager()
         self.logger = logging.getLogger(__name__)
-        self.active_transactions: Dict[str, Transaction] = {}
+
+        # Transactions live in fixed slots handed out from a free list; a finished
+        # slot keeps its Transaction object so the next begin resets it in place
+        self.max_transactions = 4096
+        self._txns: List[Optional[Transaction]] = [None] * self.max_transactions
+        # Per-slot state codes and start times, scanned in bulk by cleanup
+        self._states = array('b', [_FREE_SLOT]) * self.max_transactions
+        self._started_at = array('d', [0.0]) * self.max_transactions
+        self._free_slots: List[int] = list(range(self.max_transactions - 1, -1, -1))
+        self._tid_to_slot: Dict[str, int] = {}
+        # Guards slot allocation and state compare-and-set; never held across I/O
+        self._state_lock = threading.Lock()
+
+    @property
+    def active_transactions(self) -> Dict[str, Transaction]:
+
+        txns = self._txns
+        return {txn_id: txns[slot] for txn_id, slot in self._tid_to_slot.items()}
 
     def begin_transaction(self, transaction_id: str = None) -> str:
 
         if not transaction_id:
             transaction_id = generate_transaction_id()
 
-        if transaction_id in self.active_transactions:
-            self.logger.warning(f"Transaction {transaction_id} already exists")
-            return transaction_id
-
-        transaction = Transaction(transaction_id)
-        self.active_transactions[transaction_id] = transaction
-
-        self.logger.info(f"Started transaction {transaction_id}")
+        with self._state_lock:
+            if transaction_id in self._tid_to_slot:
+                self.logger.warning("Transaction %s already exists", transaction_id)
+                return transaction_id
+
+            try:
+                slot = self._free_slots.pop()
+            except IndexError:
+                # Past the preallocated capacity the table grows instead of refusing work
+                slot = len(self._txns)
+                self._txns.append(None)
+                self._states.append(_FREE_SLOT)
+                self._started_at.append(0.0)
+
+            transaction = self._txns[slot]
+            if transaction is None:
+                self._txns[slot] = Transaction(transaction_id, slot, self._states, self._started_at)
+            else:
+                transaction._reset(transaction_id)
+
+            self._tid_to_slot[transaction_id] = slot
+
+        self.logger.info("Started transaction %s", transaction_id)
         return transaction_id
 
     def add_query(self, transaction_id: str, query: str):
@@ -59,72 +134,79 @@ class TransactionManager:
             raise ValueError(f"Transaction {transaction_id} is not active")
 
         transaction.queries.append(query)
-        self.logger.debug(f"Added query to transaction {transaction_id}")
+        self.logger.debug("Added query to transaction %s", transaction_id)
 
     def prepare_transaction(self, transaction_id: str) -> bool:
 
         transaction = self._get_transaction(transaction_id)
 
-        self.logger.info(f"Preparing transaction {transaction_id}")
-        transaction.state = TransactionState.PREPARING
-
-        try:
+        if not self._transition(transaction, transaction_id, _CAN_PREPARE, TransactionState.PREPARING):
+            self.logger.warning("Cannot prepare transaction %s in state %s", transaction_id, transaction.state.value)
+            return False
 
-            transaction.state = TransactionState.PREPARED
-            self.logger.info(f"Transaction {transaction_id} prepared successfully")
-            return True
+        self.logger.info("Preparing transaction %s", transaction_id)
 
-        except Exception as e:
-            self.logger.error(f"Failed to prepare transaction {transaction_id}: {e}")
-            transaction.state = TransactionState.ACTIVE
+        # An abort may win the slot while it is PREPARING; the prepare then fails
+        if not self._transition(transaction, transaction_id, _IS_PREPARING, TransactionState.PREPARED):
+            self.logger.warning("Transaction %s was aborted while preparing", transaction_id)
             return False
 
+        self.logger.info("Transaction %s prepared successfully", transaction_id)
+        return True
+
     def commit_transaction(self, transaction_id: str) -> bool:
 
         transaction = self._get_transaction(transaction_id)
 
-        self.logger.info(f"Committing transaction {transaction_id}")
-        transaction.state = TransactionState.COMMITTING
+        if not self._transition(transaction, transaction_id, _CAN_COMMIT, TransactionState.COMMITTING):
+            self.logger.warning("Cannot commit transaction %s in state %s", transaction_id, transaction.state.value)
+            return False
 
-        try:
+        self.logger.info("Committing transaction %s", transaction_id)
 
-            transaction.state = TransactionState.COMMITTED
+        try:
 
             self.lock_manager.release_all_locks(transaction_id)
 
-            del self.active_transactions[transaction_id]
+            self._release_slot(transaction_id, TransactionState.COMMITTED)
 
-            self.logger.info(f"Transaction {transaction_id} committed successfully")
+            self.logger.info("Transaction %s committed successfully", transaction_id)
             return True
 
         except Exception as e:
-            self.logger.error(f"Failed to commit transaction {transaction_id}: {e}")
+            self.logger.error("Failed to commit transaction %s: %s", transaction_id, e)
             return False
 
     def abort_transaction(self, transaction_id: str) -> bool:
 
-        if transaction_id not in self.active_transactions:
-            self.logger.warning(f"Transaction {transaction_id} not found")
+        return self._abort(transaction_id, _CAN_ABORT)
+
+    def _abort(self, transaction_id: str, allowed: frozenset, started_before: Optional[float] = None) -> bool:
+
+        slot = self._tid_to_slot.get(transaction_id)
+        if slot is None:
+            self.logger.warning("Transaction %s not found", transaction_id)
             return False
 
-        transaction = self.active_transactions[transaction_id]
+        transaction = self._txns[slot]
 
-        self.logger.info(f"Aborting transaction {transaction_id}")
-        transaction.state = TransactionState.ABORTING
+        if not self._transition(transaction, transaction_id, allowed, TransactionState.ABORTING, started_before):
+            self.logger.warning("Cannot abort transaction %s in state %s", transaction_id, transaction.state.value)
+            return False
 
-        try:
+        self.logger.info("Aborting transaction %s", transaction_id)
 
-            transaction.state = TransactionState.ABORTED
+        try:
 
             self.lock_manager.release_all_locks(transaction_id)
 
-            del self.active_transactions[transaction_id]
+            self._release_slot(transaction_id, TransactionState.ABORTED)
 
-            self.logger.info(f"Transaction {transaction_id} aborted successfully")
+            self.logger.info("Transaction %s aborted successfully", transaction_id)
             return True
 
         except Exception as e:
-            self.logger.error(f"Failed to abort transaction {transaction_id}: {e}")
+            self.logger.error("Failed to abort transaction %s: %s", transaction_id, e)
             return False
 
     def rollback_transaction(self, transaction_id: str) -> bool:
@@ -153,47 +235,95 @@ class TransactionManager:
 
     def get_transaction_state(self, transaction_id: str) -> Optional[str]:
 
-        if transaction_id not in self.active_transactions:
+        slot = self._tid_to_slot.get(transaction_id)
+        if slot is None:
             return None
 
-        return self.active_transactions[transaction_id].state.value
+        return self._txns[slot].state.value
 
     def get_active_transactions(self) -> Dict[str, Any]:
 
+        active = self.active_transactions
+
         return {
-            'count': len(self.active_transactions),
+            'count': len(active),
             'transactions': {
                 txn_id: {
                     'state': txn.state.value,
                     'query_count': len(txn.queries),
                     'locks': list(txn.locks)
                 }
-                for txn_id, txn in self.active_transactions.items()
+                for txn_id, txn in active.items()
             }
         }
 
     def cleanup_stale_transactions(self, max_age_seconds: int = 3600):
 
-        import time
-
         stale_transactions = []
+        cutoff = time.monotonic() - max_age_seconds
+        started_at = self._started_at
 
-        for txn_id, txn in self.active_transactions.items():
+        # Commit and abort retire their own slots, so only aged ACTIVE transactions
+        # are candidates; expiry goes through the same compare-and-set as abort and
+        # rechecks the age there, since a slot may be reused after this unlocked scan
+        for slot, code in enumerate(self._states):
 
-            if txn.state in [TransactionState.COMMITTED, TransactionState.ABORTED]:
-                stale_transactions.append(txn_id)
+            if code in _CAN_EXPIRE and started_at[slot] < cutoff:
+                stale_transactions.append(self._txns[slot].transaction_id)
 
         for txn_id in stale_transactions:
-            self.logger.warning(f"Cleaning up stale transaction {txn_id}")
-            self.lock_manager.release_all_locks(txn_id)
-            del self.active_transactions[txn_id]
+            if self._abort(txn_id, _CAN_EXPIRE, cutoff):
+                self.logger.warning("Cleaned up stale transaction %s", txn_id)
 
-    def _get_transaction(self, transaction_id: str) -> Transaction:
+    def _transition(
+        self,
+        transaction: Transaction,
+        transaction_id: str,
+        allowed: frozenset,
+        new_state: TransactionState,
+        started_before: Optional[float] = None
+    ) -> bool:
 
-        if transaction_id not in self.active_transactions:
-            raise ValueError(f"Transaction {transaction_id} not found")
+        states = self._states
+        slot = transaction.slot
 
-        return self.active_transactions[transaction_id]
+        with self._state_lock:
+            # The id check rejects a racer whose slot was freed and reused meanwhile
+            if transaction.transaction_id != transaction_id or states[slot] not in allowed:
+                return False
+            if started_before is not None and self._started_at[slot] >= started_before:
+                return False
+
+            states[slot] = _STATE_CODES[new_state]
+            return True
+
+    def _release_slot(self, transaction_id: str, final_state: TransactionState):
+
+        in_flight = _IS_COMMITTING if final_state is TransactionState.COMMITTED else _IS_ABORTING
+
+        with self._state_lock:
+            slot = self._tid_to_slot.get(transaction_id)
+            if slot is None or self._states[slot] not in in_flight:
+                return
+
+            del self._tid_to_slot[transaction_id]
+            transaction = self._txns[slot]
+
+            # Drop references now so parked objects do not pin old queries or connections
+            transaction.queries.clear()
+            transaction.locks.clear()
+            transaction.connection = None
+
+            # Finishing and freeing are one step under the lock; a finished slot reads as free
+            self._states[slot] = _FREE_SLOT
+            self._free_slots.append(slot)
+
+    def _get_transaction(self, transaction_id: str) -> Transaction:
+
+        try:
+            return self._txns[self._tid_to_slot[transaction_id]]
+        except KeyError:
+            raise ValueError(f"Transaction {transaction_id} not found") from None
 
     def set_transaction_connection(self, transaction_id: str, connection):
 
@@ -1,4 +1,5 @@
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from typing import Dict, Any, List, Optional
 from src.communication.socket_client import SocketClient
 from src.communication.protocol import MessageProtocol
@@ -23,6 +24,11 @@ class TwoPhaseCommitCoordinator:
         self.logger = logging.getLogger(__name__)
         self.timeout = 30  # seconds
         self.prepared_query: Dict[str, str] = {}  # Store prepared queries for coordinator
+        # Participant RPCs fan out concurrently so each phase costs one RTT, not N
+        self._fanout = ThreadPoolExecutor(
+            max_workers=32,
+            thread_name_prefix=f"two_pc_{node_id}"
+        )
 
     def execute_2pc(
         self,
@@ -84,56 +90,50 @@ class TwoPhaseCommitCoordinator:
         votes_yes = []
         votes_no = []
 
-        for node in participant_nodes:
-            node_id = node['id']
-
-            if node_id == self.node_id:
-                try:
-                    if self.query_executor:
-                        self.transaction_manager.begin_transaction(transaction_id)
-                        can_commit, error = self.query_executor.prepare_query(query, transaction_id)
-                        if can_commit:
-                            self.prepared_query[transaction_id] = query
-                            votes_yes.append(node_id)
-                            self.logger.debug(f"Coordinator (node {node_id}) voted YES")
-                        else:
-                            votes_no.append(node_id)
-                            self.logger.warning(f"Coordinator (node {node_id}) voted NO: {error}")
-                    else:
-                        votes_yes.append(node_id)
-                except Exception as e:
-                    self.logger.error(f"Coordinator prepare failed: {e}")
-                    votes_no.append(node_id)
-                continue
+        pending = self._fan_out(participant_nodes, prepare_message, wait_for_response=True)
 
+        # The local vote runs while the remote prepares are in flight
+        if any(node['id'] == self.node_id for node in participant_nodes):
+            node_id = self.node_id
             try:
-                response = self.socket_client.send_message(
-                    host=node['ip'],
-                    port=node['port'],
-                    message=prepare_message,
-                    wait_for_response=True
-                )
+                if self.query_executor:
+                    self.transaction_manager.begin_transaction(transaction_id)
+                    can_commit, error = self.query_executor.prepare_query(query, transaction_id)
+                    if can_commit:
+                        self.prepared_query[transaction_id] = query
+                        votes_yes.append(node_id)
+                        self.logger.debug(f"Coordinator (node {node_id}) voted YES")
+                    else:
+                        votes_no.append(node_id)
+                        self.logger.warning(f"Coordinator (node {node_id}) voted NO: {error}")
+                else:
+                    votes_yes.append(node_id)
+            except Exception as e:
+                self.logger.error(f"Coordinator prepare failed: {e}")
+                votes_no.append(node_id)
 
-                if not response:
-                    self.logger.warning(f"No response from node {node_id}")
-                    votes_no.append(node_id)
-                    continue
+        for node_id, response, error in self._collect(pending):
+            if error is not None:
+                self.logger.error(f"Error communicating with node {node_id}: {error}")
+                votes_no.append(node_id)
+                continue
 
-                response_type = response.get('type')
+            if not response:
+                self.logger.warning(f"No response from node {node_id}")
+                votes_no.append(node_id)
+                continue
 
-                if response_type == message_types.TRANSACTION_VOTE_YES:
-                    votes_yes.append(node_id)
-                    self.logger.debug(f"Node {node_id} voted YES")
-                elif response_type == message_types.TRANSACTION_VOTE_NO:
-                    votes_no.append(node_id)
-                    self.logger.debug(f"Node {node_id} voted NO")
-                else:
-                    votes_no.append(node_id)
-                    self.logger.warning(f"Invalid response from node {node_id}")
+            response_type = response.get('type')
 
-            except Exception as e:
-                self.logger.error(f"Error communicating with node {node_id}: {e}")
+            if response_type == message_types.TRANSACTION_VOTE_YES:
+                votes_yes.append(node_id)
+                self.logger.debug(f"Node {node_id} voted YES")
+            elif response_type == message_types.TRANSACTION_VOTE_NO:
                 votes_no.append(node_id)
+                self.logger.debug(f"Node {node_id} voted NO")
+            else:
+                votes_no.append(node_id)
+                self.logger.warning(f"Invalid response from node {node_id}")
 
         all_yes = len(votes_no) == 0
 
@@ -160,41 +160,32 @@ class TwoPhaseCommitCoordinator:
         committed_nodes = []
         failed_nodes = []
 
-        for node in participant_nodes:
-            node_id = node['id']
-
-            if node_id == self.node_id:
-                try:
-                    if self.query_executor and transaction_id in self.prepared_query:
-                        query = self.prepared_query[transaction_id]
-                        self.query_executor.commit_prepared_query(query, transaction_id)
-                        self.transaction_manager.commit_transaction(transaction_id)
-                        del self.prepared_query[transaction_id]
-                        self.logger.debug(f"Coordinator (node {node_id}) committed")
-                    committed_nodes.append(node_id)
-                except Exception as e:
-                    self.logger.error(f"Coordinator commit failed: {e}")
-                    failed_nodes.append(node_id)
-                continue
+        pending = self._fan_out(participant_nodes, commit_message, wait_for_response=True)
 
+        if any(node['id'] == self.node_id for node in participant_nodes):
+            node_id = self.node_id
             try:
-                response = self.socket_client.send_message(
-                    host=node['ip'],
-                    port=node['port'],
-                    message=commit_message,
-                    wait_for_response=True
-                )
-
-                if response and response.get('type') == message_types.ACK:
-                    committed_nodes.append(node_id)
-                    self.logger.debug(f"Node {node_id} committed")
-                else:
-                    failed_nodes.append(node_id)
-                    self.logger.warning(f"Node {node_id} failed to commit")
-
+                if self.query_executor and transaction_id in self.prepared_query:
+                    query = self.prepared_query[transaction_id]
+                    self.query_executor.commit_prepared_query(query, transaction_id)
+                    self.transaction_manager.commit_transaction(transaction_id)
+                    del self.prepared_query[transaction_id]
+                    self.logger.debug(f"Coordinator (node {node_id}) committed")
+                committed_nodes.append(node_id)
             except Exception as e:
-                self.logger.error(f"Error sending commit to node {node_id}: {e}")
+                self.logger.error(f"Coordinator commit failed: {e}")
+                failed_nodes.append(node_id)
+
+        for node_id, response, error in self._collect(pending):
+            if error is not None:
+                self.logger.error(f"Error sending commit to node {node_id}: {error}")
+                failed_nodes.append(node_id)
+            elif response and response.get('type') == message_types.ACK:
+                committed_nodes.append(node_id)
+                self.logger.debug(f"Node {node_id} committed")
+            else:
                 failed_nodes.append(node_id)
+                self.logger.warning(f"Node {node_id} failed to commit")
 
         success = len(failed_nodes) == 0
 
@@ -218,23 +209,66 @@ class TwoPhaseCommitCoordinator:
             transaction_id=transaction_id
         )
 
-        for node in participant_nodes:
-            node_id = node['id']
+        pending = self._fan_out(participant_nodes, abort_message, wait_for_response=False)
 
-            if node_id == self.node_id:
+        # Aborts are fire-and-forget; outcomes are only logged as they land
+        for future, node_id in pending.items():
+            future.add_done_callback(
+                lambda done, node_id=node_id: self._log_abort_delivery(done, node_id)
+            )
+
+    def _fan_out(
+        self,
+        participant_nodes: List[Dict[str, Any]],
+        message: Dict[str, Any],
+        wait_for_response: bool
+    ) -> Dict[Future, int]:
+
+        pending = {}
+
+        for node in participant_nodes:
+            if node['id'] == self.node_id:
                 continue
 
-            try:
-                self.socket_client.send_message(
-                    host=node['ip'],
-                    port=node['port'],
-                    message=abort_message,
-                    wait_for_response=False
-                )
-                self.logger.debug(f"Sent ABORT to node {node_id}")
+            future = self._fanout.submit(
+                self.socket_client.send_message,
+                host=node['ip'],
+                port=node['port'],
+                message=message,
+                wait_for_response=wait_for_response
+            )
+            pending[future] = node['id']
 
-            except Exception as e:
-                self.logger.error(f"Error sending abort to node {node_id}: {e}")
+        return pending
+
+    def _collect(self, pending: Dict[Future, int]):
+
+        try:
+            for future in as_completed(list(pending), timeout=self.timeout):
+                node_id = pending.pop(future)
+
+                try:
+                    yield node_id, future.result(), None
+                except Exception as e:
+                    yield node_id, None, e
+
+        except FuturesTimeoutError:
+            for node_id in pending.values():
+                yield node_id, None, TimeoutError(f"no response within {self.timeout}s")
+            pending.clear()
+
+    def _log_abort_delivery(self, future: Future, node_id: int):
+
+        error = future.exception()
+
+        if error is not None:
+            self.logger.error(f"Error sending abort to node {node_id}: {error}")
+        else:
+            self.logger.debug(f"Sent ABORT to node {node_id}")
+
+    def close(self):
+
+        self._fanout.shutdown(wait=False)
 
 
 class TwoPhaseCommitParticipant:
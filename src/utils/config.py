@@ -88,6 +88,14 @@ class Config:
             'heartbeat_timeout': nodes_config.get('heartbeat_timeout', 15)
         }
 
+    def get_replication_config(self) -> Dict[str, Any]:
+
+        nodes_config = self.load_nodes_config()
+        return {
+            'wait_for_ack': nodes_config.get('replication_wait_for_ack', True),
+            'pipeline': nodes_config.get('replication_pipeline', False)
+        }
+
     def get_env(self, key: str, default: Any = None) -> Any:
 
         return os.getenv(key, default)
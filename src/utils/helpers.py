@@ -23,6 +23,12 @@ def get_timestamp() -> str:
     return datetime.utcnow().isoformat()
 
 
+def format_timestamp_ns(timestamp_ns: int) -> str:
+
+    seconds, nanoseconds = divmod(timestamp_ns, 1_000_000_000)
+    return datetime.utcfromtimestamp(seconds).replace(microsecond=nanoseconds // 1000).isoformat()
+
+
 def get_unix_timestamp() -> int:
 
     return int(time.time() * 1000)
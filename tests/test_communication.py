@@ -1,6 +1,12 @@
 
+import socket
+import struct
+import threading
+import time
 import pytest
 from src.communication.protocol import MessageProtocol
+from src.communication.socket_client import SocketClient
+from src.communication.socket_server import SocketServer
 from src.communication import message_types
 from src.security.checksum import verify_message_checksum
 
@@ -67,6 +73,16 @@ def test_message_encoding_decoding():
     assert verify_message_checksum(decoded)
 
 
+def test_frame_prefixes_encoded_length():
+    message = MessageProtocol.create_heartbeat_message(sender_id=1)
+
+    frame = MessageProtocol.frame(message)
+    length = int.from_bytes(frame[:4], byteorder='big')
+
+    assert length == len(frame) - 4
+    assert MessageProtocol.decode_message(frame[4:])['type'] == message_types.HEARTBEAT
+
+
 def test_verify_message():
     message = MessageProtocol.create_heartbeat_message(sender_id=1)
 
@@ -75,3 +91,191 @@ def test_verify_message():
     message['data']['tampered'] = True
 
     assert not MessageProtocol.verify_message(message)
+
+
+class CountingServer(SocketServer):
+
+    def __init__(self, message_handler):
+        super().__init__(host="127.0.0.1", port=0, message_handler=message_handler)
+        self.connections = 0
+
+    def _handle_client(self, client_socket, client_address):
+        self.connections += 1
+        super()._handle_client(client_socket, client_address)
+
+
+def start_server(handler):
+    server = CountingServer(handler)
+    server.start()
+
+    deadline = time.time() + 2
+    while server.server_socket is None or server.server_socket.getsockname()[1] == 0:
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+    return server, server.server_socket.getsockname()[1]
+
+
+def test_send_oneway_reuses_connection():
+    received = []
+    done = threading.Event()
+
+    def handler(message):
+        received.append(message)
+        if len(received) == 2:
+            done.set()
+        return None
+
+    server, port = start_server(handler)
+    client = SocketClient(timeout=2)
+    frame = MessageProtocol.frame(MessageProtocol.create_heartbeat_message(sender_id=1))
+
+    try:
+        client.send_oneway("127.0.0.1", port, frame)
+        client.send_oneway("127.0.0.1", port, frame)
+
+        assert done.wait(2)
+        assert server.connections == 1
+        assert all(message['type'] == message_types.HEARTBEAT for message in received)
+    finally:
+        client.close()
+        server.stop()
+
+
+def test_send_message_reuses_pooled_connection():
+    def handler(message):
+        return MessageProtocol.create_response(sender_id=2, success=True)
+
+    server, port = start_server(handler)
+    client = SocketClient(timeout=2)
+    message = MessageProtocol.create_query_message(sender_id=1, query="SELECT 1")
+
+    try:
+        assert client.send_message("127.0.0.1", port, message)['data']['success']
+        assert client.send_message("127.0.0.1", port, message)['data']['success']
+        assert server.connections == 1
+
+        # A pooled socket the peer has dropped as idle is replaced transparently
+        server.idle_timeout = 0.1
+        assert client.send_message("127.0.0.1", port, message)['data']['success']
+        time.sleep(0.3)
+        assert client.send_message("127.0.0.1", port, message)['data']['success']
+        assert server.connections == 2
+    finally:
+        client.close()
+        server.stop()
+
+
+def test_send_message_does_not_replay_delivered_request():
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    port = listener.getsockname()[1]
+    received = []
+
+    def serve():
+        conn, _ = listener.accept()
+        for reply in (True, False):
+            length = int.from_bytes(conn.recv(4), byteorder='big')
+            payload = b''
+            while len(payload) < length:
+                payload += conn.recv(length - len(payload))
+            received.append(payload)
+
+            if reply:
+                conn.sendall(MessageProtocol.frame(MessageProtocol.create_response(sender_id=2, success=True)))
+
+        # Abortive close after reading the second request
+        conn.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+        conn.close()
+
+    server = threading.Thread(target=serve, daemon=True)
+    server.start()
+
+    client = SocketClient(timeout=2)
+    message = MessageProtocol.create_heartbeat_message(sender_id=1)
+
+    try:
+        assert client.send_message("127.0.0.1", port, message)['data']['success']
+
+        # The second request reached the peer on the pooled socket, so it must not be resent
+        with pytest.raises(ConnectionError):
+            client.send_message("127.0.0.1", port, message)
+
+        server.join(timeout=2)
+        listener.settimeout(0.2)
+        with pytest.raises(socket.timeout):
+            listener.accept()
+        assert len(received) == 2
+    finally:
+        client.close()
+        listener.close()
+
+
+def test_send_batch_reports_unreachable_targets():
+    received = []
+    done = threading.Event()
+
+    def handler(message):
+        received.append(message)
+        if len(received) == 2:
+            done.set()
+        return None
+
+    server, port = start_server(handler)
+
+    closed = socket.socket()
+    closed.bind(("127.0.0.1", 0))
+    closed_port = closed.getsockname()[1]
+    closed.close()
+
+    client = SocketClient(timeout=2)
+    frame = MessageProtocol.frame(MessageProtocol.create_heartbeat_message(sender_id=1))
+
+    try:
+        failures = client.send_batch([("127.0.0.1", port), ("127.0.0.1", closed_port)], frame)
+        assert list(failures) == [("127.0.0.1", closed_port)]
+
+        assert not client.send_batch([("127.0.0.1", port)], frame)
+        assert done.wait(2)
+        assert all(message['type'] == message_types.HEARTBEAT for message in received)
+        assert server.connections == 1
+    finally:
+        client.close()
+        server.stop()
+
+
+def test_request_without_handler_reply_gets_empty_ack():
+    received = []
+
+    def handler(message):
+        received.append(message['type'])
+        return None
+
+    server, port = start_server(handler)
+    client = SocketClient(timeout=2)
+    heartbeat = MessageProtocol.frame(MessageProtocol.create_heartbeat_message(sender_id=1))
+    request = MessageProtocol.create_election_message(sender_id=1, receiver_id=2)
+
+    try:
+        started = time.monotonic()
+        response = client.send_message("127.0.0.1", port, request)
+
+        assert response['type'] == message_types.ACK
+        assert time.monotonic() - started < 1
+
+        # One-way messages get no reply, so nothing is left unread on the persistent socket
+        client.send_oneway("127.0.0.1", port, heartbeat)
+        client.send_oneway("127.0.0.1", port, heartbeat)
+        deadline = time.time() + 2
+        while len(received) < 3:
+            assert time.time() < deadline
+            time.sleep(0.01)
+
+        with socket.create_connection(("127.0.0.1", port), timeout=0.3) as sock:
+            sock.sendall(heartbeat)
+            with pytest.raises(socket.timeout):
+                sock.recv(1)
+    finally:
+        client.close()
+        server.stop()
@@ -1,3 +1,5 @@
+import threading
+import time
 import pytest
 from unittest.mock import Mock, MagicMock
 from src.core.election import BullyElection
@@ -77,3 +79,24 @@ def test_reset_election():
 
     assert not election.election_in_progress
     assert election.coordinator_id is None
+
+
+def test_election_returns_when_announcement_arrives():
+    socket_client = Mock()
+    socket_client.send_message.return_value = {'type': message_types.ELECTION_OK}
+    election = BullyElection(node_id=1, socket_client=socket_client)
+    election.election_timeout = 5
+
+    all_nodes = [
+        {'id': 1, 'ip': 'node1', 'port': 5001},
+        {'id': 3, 'ip': 'node3', 'port': 5003}
+    ]
+
+    timer = threading.Timer(0.05, election.handle_coordinator_announcement, args=(3,))
+    timer.start()
+
+    started = time.monotonic()
+    coordinator = election.start_election(all_nodes)
+
+    assert coordinator == 3
+    assert time.monotonic() - started < 2
@@ -1,6 +1,8 @@
+import threading
 import pytest
 from unittest.mock import Mock
 from src.database.replication import ReplicationManager
+from src.communication.protocol import MessageProtocol
 from src.communication import message_types
 
 
@@ -62,3 +64,400 @@ def test_log_replication():
     assert replication_manager.replication_log[0]['transaction_id'] == "TXN-001"
     assert replication_manager.replication_log[0]['successful_nodes'] == [2, 3]
     assert replication_manager.replication_log[0]['failed_nodes'] == []
+    assert replication_manager.replication_log[0]['query_id'] == 1
+
+
+def test_check_replication_consistency_after_log():
+    socket_client = Mock()
+    replication_manager = ReplicationManager(
+        node_id=1,
+        socket_client=socket_client
+    )
+
+    replication_manager._log_replication(
+        transaction_id="TXN-001",
+        query="INSERT INTO users VALUES (1, 'Test')",
+        successful_nodes=[2],
+        failed_nodes=[3]
+    )
+
+    result = replication_manager.check_replication_consistency("TXN-001")
+
+    assert not result['consistent']
+    assert result['failed_nodes'] == [3]
+    assert result['needs_repair']
+
+
+def test_replicate_query_fans_out_to_peers():
+    socket_client = Mock()
+
+    def send_raw(host, port, frame, wait_for_response):
+        if port == 5003:
+            raise ConnectionError("unreachable")
+        return {'type': message_types.REPLICATION_ACK}
+
+    socket_client.send_raw.side_effect = send_raw
+    replication_manager = ReplicationManager(
+        node_id=1,
+        socket_client=socket_client
+    )
+
+    all_nodes = [
+        {'id': 1, 'ip': 'node1', 'port': 5001},
+        {'id': 2, 'ip': 'node2', 'port': 5002},
+        {'id': 3, 'ip': 'node3', 'port': 5003}
+    ]
+
+    result = replication_manager.replicate_query(
+        query="INSERT INTO users VALUES (1, 'Test')",
+        transaction_id="TXN-001",
+        target_nodes=all_nodes
+    )
+
+    assert socket_client.send_raw.call_count == 2
+    assert result['total_nodes'] == 2
+    assert result['successful_nodes'] == [2]
+    assert result['failed_nodes'] == [3]
+    assert not result['success']
+    assert not result['pending']
+
+
+def test_handle_replication_request_nacks_failed_execution():
+    socket_client = Mock()
+    replication_manager = ReplicationManager(
+        node_id=2,
+        socket_client=socket_client
+    )
+
+    query_executor = Mock()
+    query_executor.execute.return_value = Mock(success=False, error="Duplicate entry")
+
+    response = replication_manager.handle_replication_request(
+        query="INSERT INTO users VALUES (1, 'Test')",
+        transaction_id="TXN-001",
+        sender_id=1,
+        query_executor=query_executor
+    )
+
+    assert response['type'] == message_types.REPLICATION_NACK
+    assert response['data']['error'] == "Duplicate entry"
+
+
+def test_replication_log_evicts_oldest_entries():
+    socket_client = Mock()
+    replication_manager = ReplicationManager(
+        node_id=1,
+        socket_client=socket_client
+    )
+
+    for i in range(1005):
+        replication_manager._log_replication(
+            transaction_id=f"TXN-{i}",
+            query="INSERT INTO users VALUES (1, 'Test')",
+            successful_nodes=[2],
+            failed_nodes=[3] if i % 2 else []
+        )
+
+    stats = replication_manager.get_replication_stats()
+
+    assert stats['total_replications'] == 1000
+    assert stats['failed'] == 500
+    assert replication_manager._get_replication_entry("TXN-4") is None
+    assert replication_manager._get_replication_entry("TXN-5")['successful_nodes'] == [2]
+    assert replication_manager._get_replication_entry("TXN-1004")['failed_nodes'] == []
+
+
+def test_batched_replication_acks():
+    socket_client = Mock()
+    replica = ReplicationManager(
+        node_id=2,
+        socket_client=socket_client
+    )
+    replica.set_peers([{'id': 1, 'ip': 'node1', 'port': 5001}])
+    replica.ack_flush_interval = 60
+
+    query_executor = Mock()
+    query_executor.execute.return_value = Mock(success=True, error=None)
+
+    for transaction_id in ("TXN-001", "TXN-002"):
+        response = replica.handle_replication_request(
+            query="INSERT INTO users VALUES (1, 'Test')",
+            transaction_id=transaction_id,
+            sender_id=1,
+            query_executor=query_executor,
+            ack_batched=True
+        )
+        assert response is None
+
+    replica.close()
+
+    socket_client.send_oneway.assert_called_once()
+    frame = socket_client.send_oneway.call_args.kwargs['frame']
+    ack_batch = MessageProtocol.decode_message(frame[4:])
+    assert ack_batch['type'] == message_types.REPLICATION_ACK_BATCH
+    assert ack_batch['data']['transaction_ids'] == ["TXN-001", "TXN-002"]
+
+    coordinator = ReplicationManager(
+        node_id=1,
+        socket_client=Mock()
+    )
+    coordinator._log_replication("TXN-001", "INSERT INTO users VALUES (1, 'Test')", [], [])
+    coordinator.handle_ack_batch(2, ack_batch['data']['transaction_ids'])
+
+    assert coordinator.check_replication_consistency("TXN-001")['successful_nodes'] == [2]
+
+
+def test_replicate_query_defaults_to_peers():
+    socket_client = Mock()
+    socket_client.send_raw.return_value = {'type': message_types.REPLICATION_ACK}
+    replication_manager = ReplicationManager(
+        node_id=1,
+        socket_client=socket_client
+    )
+    replication_manager.set_peers([
+        {'id': 1, 'ip': 'node1', 'port': 5001},
+        {'id': 2, 'ip': 'node2', 'port': 5002},
+        {'id': 3, 'ip': 'node3', 'port': 5003}
+    ])
+
+    result = replication_manager.replicate_query(
+        query="INSERT INTO users VALUES (1, 'Test')",
+        transaction_id="TXN-001"
+    )
+
+    assert replication_manager.peer_count == 2
+    assert result['total_nodes'] == 2
+    assert sorted(result['successful_nodes']) == [2, 3]
+    assert result['success']
+
+
+def test_replicate_query_sends_concurrently():
+    socket_client = Mock()
+    barrier = threading.Barrier(2, timeout=2)
+
+    def send_raw(host, port, frame, wait_for_response):
+        barrier.wait()
+        return {'type': message_types.REPLICATION_ACK}
+
+    socket_client.send_raw.side_effect = send_raw
+    replication_manager = ReplicationManager(
+        node_id=1,
+        socket_client=socket_client
+    )
+
+    result = replication_manager.replicate_query(
+        query="INSERT INTO users VALUES (1, 'Test')",
+        transaction_id="TXN-001",
+        target_nodes=[
+            {'id': 2, 'ip': 'node2', 'port': 5002},
+            {'id': 3, 'ip': 'node3', 'port': 5003}
+        ]
+    )
+
+    assert result['success']
+    assert sorted(result['successful_nodes']) == [2, 3]
+
+
+def test_pipelined_replication_batches_per_peer():
+    socket_client = Mock()
+
+    def send_message(host, port, message, wait_for_response):
+        entries = message['data']['entries']
+        return {
+            'type': message_types.REPLICATION_ACK,
+            'data': {'acked': [entry['transaction_id'] for entry in entries], 'failed': {}}
+        }
+
+    socket_client.send_message.side_effect = send_message
+    replication_manager = ReplicationManager(
+        node_id=1,
+        socket_client=socket_client
+    )
+    replication_manager.pipeline_enabled = True
+    replication_manager.set_peers([
+        {'id': 1, 'ip': 'node1', 'port': 5001},
+        {'id': 2, 'ip': 'node2', 'port': 5002}
+    ])
+
+    result = replication_manager.replicate_query(
+        query="INSERT INTO users VALUES (1, 'Test')",
+        transaction_id="TXN-001"
+    )
+    replication_manager.close()
+
+    assert result['successful_nodes'] == [2]
+    sent = socket_client.send_message.call_args.kwargs['message']
+    assert sent['data']['entries'] == [
+        {'transaction_id': "TXN-001", 'query': "INSERT INTO users VALUES (1, 'Test')"}
+    ]
+
+
+def test_handle_replication_batch_acks_per_entry():
+    replication_manager = ReplicationManager(
+        node_id=2,
+        socket_client=Mock()
+    )
+
+    query_executor = Mock()
+    query_executor.execute.side_effect = [
+        Mock(success=True, error=None),
+        Mock(success=False, error="Duplicate entry")
+    ]
+
+    response = replication_manager.handle_replication_batch(
+        entries=[
+            {'transaction_id': "TXN-001", 'query': "INSERT INTO users VALUES (1, 'A')"},
+            {'transaction_id': "TXN-002", 'query': "INSERT INTO users VALUES (1, 'B')"}
+        ],
+        sender_id=1,
+        query_executor=query_executor
+    )
+
+    assert response['type'] == message_types.REPLICATION_ACK
+    assert response['data']['acked'] == ["TXN-001"]
+    assert response['data']['failed'] == {"TXN-002": "Duplicate entry"}
+
+
+def test_replication_counts_as_heartbeat_activity():
+    socket_client = Mock()
+    socket_client.send_raw.return_value = {'type': message_types.REPLICATION_ACK}
+    replication_manager = ReplicationManager(
+        node_id=1,
+        socket_client=socket_client
+    )
+    replication_manager.heartbeat_monitor = Mock()
+
+    replication_manager.replicate_query(
+        query="INSERT INTO users VALUES (1, 'Test')",
+        transaction_id="TXN-001",
+        target_nodes=[{'id': 2, 'ip': 'node2', 'port': 5002}]
+    )
+
+    replication_manager.heartbeat_monitor.note_sent.assert_called_once_with(2)
+    replication_manager.heartbeat_monitor.note_activity.assert_called_once_with(2)
+
+
+def test_async_replication_returns_before_sending():
+    socket_client = Mock()
+    release = threading.Event()
+    socket_client.send_oneway.side_effect = lambda host, port, frame: release.wait(2)
+    replication_manager = ReplicationManager(
+        node_id=1,
+        socket_client=socket_client
+    )
+
+    result = replication_manager.replicate_query(
+        query="INSERT INTO users VALUES (1, 'Test')",
+        transaction_id="TXN-001",
+        target_nodes=[{'id': 2, 'ip': 'node2', 'port': 5002}],
+        wait_for_ack=False
+    )
+
+    assert result['success'] is True
+    assert result['pending'] is True
+    assert result['successful_nodes'] == []
+    assert result['pending_nodes'] == [2]
+    assert not replication_manager.check_replication_consistency("TXN-001")['consistent']
+
+    release.set()
+    replication_manager.close()
+
+    socket_client.send_oneway.assert_called_once()
+    assert not socket_client.send_raw.called
+
+    replication_manager.handle_ack_batch(2, ["TXN-001"])
+    consistency = replication_manager.check_replication_consistency("TXN-001")
+    assert consistency['successful_nodes'] == [2]
+    assert consistency['pending_nodes'] == []
+    assert consistency['consistent']
+
+
+def test_replicate_query_returns_at_quorum():
+    socket_client = Mock()
+    release = threading.Event()
+
+    def send_raw(host, port, frame, wait_for_response):
+        if port == 5004:
+            release.wait(2)
+        return {'type': message_types.REPLICATION_ACK}
+
+    socket_client.send_raw.side_effect = send_raw
+    replication_manager = ReplicationManager(
+        node_id=1,
+        socket_client=socket_client
+    )
+
+    result = replication_manager.replicate_query(
+        query="INSERT INTO users VALUES (1, 'Test')",
+        transaction_id="TXN-001",
+        target_nodes=[
+            {'id': 2, 'ip': 'node2', 'port': 5002},
+            {'id': 3, 'ip': 'node3', 'port': 5003},
+            {'id': 4, 'ip': 'node4', 'port': 5004}
+        ]
+    )
+
+    assert result['success']
+    assert sorted(result['successful_nodes']) == [2, 3]
+    assert result['pending_nodes'] == [4]
+
+    release.set()
+    replication_manager.close()
+    replication_manager._fanout.shutdown(wait=True)
+
+    consistency = replication_manager.check_replication_consistency("TXN-001")
+    assert sorted(consistency['successful_nodes']) == [2, 3, 4]
+    assert consistency['consistent']
+
+
+def test_straggler_settles_into_its_own_attempt():
+    socket_client = Mock()
+    release = threading.Event()
+
+    def send_raw(host, port, frame, wait_for_response):
+        if port == 5004:
+            release.wait(2)
+            return None
+        return {'type': message_types.REPLICATION_ACK}
+
+    socket_client.send_raw.side_effect = send_raw
+    replication_manager = ReplicationManager(
+        node_id=1,
+        socket_client=socket_client
+    )
+    query = "INSERT INTO users VALUES (1, 'Test')"
+
+    replication_manager.replicate_query(
+        query=query,
+        transaction_id="TXN-001",
+        target_nodes=[
+            {'id': 2, 'ip': 'node2', 'port': 5002},
+            {'id': 3, 'ip': 'node3', 'port': 5003},
+            {'id': 4, 'ip': 'node4', 'port': 5004}
+        ]
+    )
+    repair = replication_manager.repair_failed_replication(
+        "TXN-001", query, [{'id': 5, 'ip': 'node5', 'port': 5005}]
+    )
+    assert repair['success']
+
+    release.set()
+    replication_manager.close()
+    replication_manager._fanout.shutdown(wait=True)
+
+    first, second = replication_manager.replication_log
+    assert first['failed_nodes'] == [4]
+    assert second['failed_nodes'] == []
+    assert replication_manager.check_replication_consistency("TXN-001")['consistent']
+
+
+def test_statement_texts_follow_retained_log_entries():
+    replication_manager = ReplicationManager(node_id=1, socket_client=Mock())
+
+    for i in range(5000):
+        replication_manager._log_replication(f"TXN-{i}", f"INSERT INTO t VALUES ({i})", [2], [])
+
+    log = replication_manager.replication_log
+    assert all(entry['query'] == f"INSERT INTO t VALUES ({i})" for i, entry in zip(range(4000, 5000), log))
+    assert len(replication_manager._stmt_texts) == replication_manager.replication_log_size
+    replication_manager.close()
@@ -1,6 +1,11 @@
+import threading
+import time
 import pytest
+from unittest.mock import Mock
 from src.transaction.lock_manager import LockManager, LockType
 from src.transaction.transaction_manager import TransactionManager, TransactionState
+from src.transaction.two_phase_commit import TwoPhaseCommitCoordinator
+from src.communication import message_types
 
 
 def test_lock_manager_initialization():
@@ -61,6 +66,28 @@ def test_multiple_shared_locks():
     assert lock_manager.has_lock("users", "TXN-002")
 
 
+def test_sole_shared_holder_upgrades_in_place():
+    lock_manager = LockManager()
+    lock_manager.acquire_lock("users", "TXN-001", LockType.SHARED)
+
+    assert lock_manager.acquire_lock("users", "TXN-001", LockType.EXCLUSIVE, timeout=0.05)
+
+    info = lock_manager.get_lock_info("users")
+    assert [lock['type'] for lock in info['locks']] == ['EXCLUSIVE']
+    assert not lock_manager.acquire_lock("users", "TXN-002", LockType.SHARED, timeout=0.05)
+
+
+def test_upgrade_waits_for_other_shared_holders():
+    lock_manager = LockManager()
+    lock_manager.acquire_lock("users", "TXN-001", LockType.SHARED)
+    lock_manager.acquire_lock("users", "TXN-002", LockType.SHARED)
+
+    assert not lock_manager.acquire_lock("users", "TXN-001", LockType.EXCLUSIVE, timeout=0.05)
+
+    lock_manager.release_lock("users", "TXN-002")
+    assert lock_manager.acquire_lock("users", "TXN-001", LockType.EXCLUSIVE, timeout=0.05)
+
+
 def test_release_lock():
     lock_manager = LockManager()
 
@@ -89,6 +116,52 @@ def test_release_all_locks():
     assert not lock_manager.has_lock("orders", "TXN-001")
 
 
+def test_waiting_acquire_wakes_on_release():
+    lock_manager = LockManager()
+    lock_manager.acquire_lock("users", "TXN-001", LockType.EXCLUSIVE, timeout=1)
+
+    timer = threading.Timer(0.05, lock_manager.release_lock, args=("users", "TXN-001"))
+    timer.start()
+
+    started = time.monotonic()
+    assert lock_manager.acquire_lock("users", "TXN-002", LockType.EXCLUSIVE, timeout=5)
+    assert time.monotonic() - started < 1
+    assert lock_manager.has_lock("users", "TXN-002")
+
+
+def test_acquire_times_out_on_conflict():
+    lock_manager = LockManager()
+    lock_manager.acquire_lock("users", "TXN-001", LockType.EXCLUSIVE, timeout=1)
+
+    assert not lock_manager.acquire_lock("users", "TXN-002", LockType.SHARED, timeout=0.05)
+
+
+def test_acquire_fails_fast_on_deadlock():
+    lock_manager = LockManager()
+    lock_manager.acquire_lock("users", "TXN-001", LockType.EXCLUSIVE)
+    lock_manager.acquire_lock("orders", "TXN-002", LockType.EXCLUSIVE)
+
+    results = {}
+    waiter = threading.Thread(
+        target=lambda: results.setdefault(
+            "TXN-001", lock_manager.acquire_lock("orders", "TXN-001", LockType.EXCLUSIVE, timeout=5)
+        )
+    )
+    waiter.start()
+
+    while "TXN-001" not in lock_manager._waiting:
+        time.sleep(0.01)
+
+    started = time.monotonic()
+    assert not lock_manager.acquire_lock("users", "TXN-002", LockType.EXCLUSIVE, timeout=5)
+    assert time.monotonic() - started < 1
+
+    lock_manager.release_all_locks("TXN-002")
+    waiter.join(timeout=5)
+    assert results["TXN-001"]
+    assert not lock_manager.detect_deadlock("TXN-001")
+
+
 def test_transaction_manager_initialization():
     lock_manager = LockManager()
     tx_manager = TransactionManager(node_id=1, lock_manager=lock_manager)
@@ -140,6 +213,66 @@ def test_prepare_transaction():
     assert tx_manager.get_transaction_state(tx_id) == TransactionState.PREPARED.value
 
 
+def test_state_transitions_reject_invalid_source_state():
+    lock_manager = LockManager()
+    tx_manager = TransactionManager(node_id=1, lock_manager=lock_manager)
+
+    tx_id = tx_manager.begin_transaction()
+
+    assert tx_manager.prepare_transaction(tx_id)
+    assert not tx_manager.prepare_transaction(tx_id)
+    assert tx_manager.get_transaction_state(tx_id) == TransactionState.PREPARED.value
+    assert tx_manager.commit_transaction(tx_id)
+
+
+def test_concurrent_commits_settle_exactly_once():
+    lock_manager = LockManager()
+    tx_manager = TransactionManager(node_id=1, lock_manager=lock_manager)
+    tx_id = tx_manager.begin_transaction()
+
+    outcomes = []
+    barrier = threading.Barrier(8)
+
+    def commit():
+        barrier.wait()
+        try:
+            outcomes.append(tx_manager.commit_transaction(tx_id))
+        except ValueError:
+            outcomes.append(False)
+
+    threads = [threading.Thread(target=commit) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert outcomes.count(True) == 1
+    assert tx_id not in tx_manager.active_transactions
+
+
+def test_concurrent_begins_past_capacity_get_distinct_slots():
+    tx_manager = TransactionManager(node_id=1, lock_manager=LockManager())
+    for _ in range(tx_manager.max_transactions):
+        tx_manager.begin_transaction()
+
+    barrier = threading.Barrier(8)
+
+    def begin():
+        barrier.wait()
+        for _ in range(50):
+            tx_manager.begin_transaction()
+
+    threads = [threading.Thread(target=begin) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    slots = list(tx_manager._tid_to_slot.values())
+    assert len(slots) == tx_manager.max_transactions + 400
+    assert len(set(slots)) == len(slots)
+
+
 def test_get_active_transactions():
     lock_manager = LockManager()
     tx_manager = TransactionManager(node_id=1, lock_manager=lock_manager)
@@ -152,3 +285,145 @@ def test_get_active_transactions():
     assert active['count'] == 2
     assert tx1 in active['transactions']
     assert tx2 in active['transactions']
+
+
+def test_cleanup_removes_transactions_older_than_max_age():
+    lock_manager = LockManager()
+    tx_manager = TransactionManager(node_id=1, lock_manager=lock_manager)
+
+    tx_id = tx_manager.begin_transaction()
+    tx_manager.acquire_lock(tx_id, "users", LockType.EXCLUSIVE)
+
+    tx_manager.cleanup_stale_transactions(max_age_seconds=3600)
+    assert tx_id in tx_manager.active_transactions
+
+    time.sleep(0.02)
+    tx_manager.cleanup_stale_transactions(max_age_seconds=0.01)
+    assert tx_id not in tx_manager.active_transactions
+    assert not lock_manager.has_lock("users", tx_id)
+
+
+def test_two_phase_commit_contacts_participants_concurrently():
+
+    class SlowClient:
+
+        def send_message(self, host, port, message, wait_for_response=True):
+            time.sleep(0.2)
+            if message['type'] == message_types.TRANSACTION_PREPARE:
+                return {'type': message_types.TRANSACTION_VOTE_YES}
+            return {'type': message_types.ACK}
+
+    lock_manager = LockManager()
+    tx_manager = TransactionManager(node_id=1, lock_manager=lock_manager)
+    coordinator = TwoPhaseCommitCoordinator(1, SlowClient(), tx_manager)
+    participants = [{'id': node_id, 'ip': '127.0.0.1', 'port': 9000 + node_id} for node_id in range(1, 6)]
+
+    started = time.monotonic()
+    result = coordinator.execute_2pc("TXN-001", "UPDATE users SET a = 1", participants)
+    elapsed = time.monotonic() - started
+    coordinator.close()
+
+    assert result['success']
+    assert elapsed < 1.2
+
+
+def test_cleanup_keeps_prepared_transactions():
+    tx_manager = TransactionManager(node_id=1, lock_manager=LockManager())
+
+    tx_id = tx_manager.begin_transaction()
+    tx_manager.acquire_lock(tx_id, "users", LockType.EXCLUSIVE)
+    tx_manager.prepare_transaction(tx_id)
+
+    time.sleep(0.02)
+    tx_manager.cleanup_stale_transactions(max_age_seconds=0.01)
+
+    assert tx_manager.get_transaction_state(tx_id) == TransactionState.PREPARED.value
+    assert tx_manager.lock_manager.has_lock("users", tx_id)
+
+
+def test_cleanup_races_with_commit_and_abort():
+    tx_manager = TransactionManager(node_id=1, lock_manager=LockManager())
+    tx_ids = [tx_manager.begin_transaction() for _ in range(200)]
+    time.sleep(0.02)
+
+    errors = []
+    committed = {}
+    barrier = threading.Barrier(3)
+
+    def finish(ids, commit):
+        barrier.wait()
+        for tx_id in ids:
+            try:
+                if commit:
+                    committed[tx_id] = tx_manager.commit_transaction(tx_id)
+                else:
+                    tx_manager.abort_transaction(tx_id)
+            except ValueError:
+                pass
+            except Exception as e:
+                errors.append(e)
+
+    def cleanup():
+        barrier.wait()
+        try:
+            for _ in range(20):
+                tx_manager.cleanup_stale_transactions(max_age_seconds=0.01)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target=finish, args=(tx_ids[::2], True)),
+        threading.Thread(target=finish, args=(tx_ids[1::2], False)),
+        threading.Thread(target=cleanup)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert not tx_manager.active_transactions
+    assert len(tx_manager._free_slots) == tx_manager.max_transactions
+
+
+def test_abort_during_prepare_fails_the_prepare():
+    tx_manager = TransactionManager(node_id=1, lock_manager=LockManager())
+    tx_id = tx_manager.begin_transaction()
+    reused = []
+    log_info = tx_manager.logger.info
+
+    # Abort and reuse the slot in the window between PREPARING and PREPARED
+    def info(msg, *args):
+        if msg.startswith("Preparing transaction"):
+            tx_manager.abort_transaction(tx_id)
+            reused.append(tx_manager.begin_transaction())
+        log_info(msg, *args)
+
+    tx_manager.logger = Mock(wraps=tx_manager.logger, info=info)
+
+    assert not tx_manager.prepare_transaction(tx_id)
+    assert tx_manager.get_transaction_state(tx_id) is None
+    assert tx_manager.get_transaction_state(reused[0]) == TransactionState.ACTIVE.value
+
+
+def test_cleanup_spares_transaction_that_reused_a_stale_slot():
+    tx_manager = TransactionManager(node_id=1, lock_manager=LockManager())
+    stale_id = tx_manager.begin_transaction()
+    time.sleep(0.02)
+    armed = [True]
+    fresh = []
+
+    # Reuse the stale slot between cleanup's scan and its read of the transaction id
+    class ReusingTable(list):
+
+        def __getitem__(self, slot):
+            if armed:
+                armed.pop()
+                tx_manager.abort_transaction(stale_id)
+                fresh.append(tx_manager.begin_transaction())
+            return list.__getitem__(self, slot)
+
+    tx_manager._txns = ReusingTable(tx_manager._txns)
+    tx_manager.cleanup_stale_transactions(max_age_seconds=0.01)
+
+    assert tx_manager.get_transaction_state(fresh[0]) == TransactionState.ACTIVE.value